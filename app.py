@@ -4,6 +4,7 @@ import tempfile
 from pathlib import Path
 import traceback
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from processors.document_processor import DocumentProcessor
 from processors.image_processor import ImageProcessor
@@ -12,29 +13,98 @@ from processors.video_processor import VideoProcessor
 from processors.youtube_processor import YouTubeProcessor
 from database.vector_db import VectorDatabase
 from utils.gemini_client import GeminiClient
-from utils.file_utils import get_file_type, save_uploaded_file
+from utils.file_utils import get_file_type, save_uploaded_file, make_preview
+
+# Shared, stateless Gemini client (created once per process, not per session)
+@st.cache_resource
+def get_gemini_client():
+    return GeminiClient()
 
 # Initialize session state
 if 'vector_db' not in st.session_state:
     st.session_state.vector_db = VectorDatabase()
 if 'gemini_client' not in st.session_state:
-    st.session_state.gemini_client = GeminiClient()
+    st.session_state.gemini_client = get_gemini_client()
 if 'processed_files' not in st.session_state:
-    st.session_state.processed_files = []
+    st.session_state.processed_files = st.session_state.vector_db.list_files_with_preview()
+if 'processed_names' not in st.session_state:
+    st.session_state.processed_names = {f['name'] for f in st.session_state.processed_files}
 
 # Initialize processors
 @st.cache_resource
 def get_processors():
+    audio_processor = AudioProcessor()
     return {
         'document': DocumentProcessor(),
         'image': ImageProcessor(),
-        'audio': AudioProcessor(),
-        'video': VideoProcessor(),
+        'audio': audio_processor,
+        'video': VideoProcessor(audio_processor),
         'youtube': YouTubeProcessor()
     }
 
 processors = get_processors()
 
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_answer(query, corpus_version, _vector_db, _gemini_client):
+    """
+    Search the knowledge base and generate an answer with Gemini.
+    Cached per (query, corpus_version); the underscored arguments are not hashed.
+    
+    Returns:
+        Tuple of (answer, search results); answer is None when nothing matched
+    """
+    # Search for relevant content
+    results = _vector_db.search(query, top_k=3)
+    if not results:
+        return None, []
+    
+    # Prepare context for Gemini
+    context = "\n\n".join([
+        f"Source: {result.metadata['filename']}\n{result.content}" 
+        for result in results
+    ])
+    
+    # Generate answer using Gemini
+    answer = _gemini_client.answer_question(query, context)
+    return answer, results
+
+def _ingest_one(uploaded_file):
+    """
+    Save an uploaded file and extract its text content.
+    Runs on a worker thread, so it must not call Streamlit APIs.
+    
+    Args:
+        uploaded_file: Streamlit uploaded file object
+        
+    Returns:
+        Tuple of (filename, file type, extracted content)
+    """
+    # Save uploaded file temporarily
+    temp_path = save_uploaded_file(uploaded_file)
+    try:
+        # Get file type and process
+        file_type = get_file_type(uploaded_file.name)
+        content = ""
+        
+        if file_type == 'document':
+            content = processors['document'].process(temp_path)
+        elif file_type == 'image':
+            content = processors['image'].process(temp_path)
+        elif file_type == 'audio':
+            content = processors['audio'].process(temp_path)
+        elif file_type == 'video':
+            content = processors['video'].process(temp_path)
+        
+        return uploaded_file.name, file_type, content
+    finally:
+        # Clean up temp file
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+def _ingest_youtube(url):
+    """Extract content from a YouTube URL (worker-thread counterpart of _ingest_one)"""
+    return url, 'youtube', processors['youtube'].process(url)
+
 st.title("🤖 Multimodal Data Processing System")
 st.markdown("Upload files or provide YouTube URLs to build your knowledge base, then ask questions!")
 
@@ -68,73 +138,47 @@ with st.sidebar:
     if st.button("🔄 Process Files", type="primary"):
         if uploaded_files or youtube_url:
             try:
-                processed_count = 0
+                new_texts = []
+                new_metadatas = []
+                new_files = []
                 
-                # Process uploaded files
-                for uploaded_file in uploaded_files or []:
-                    # Check if file already processed
-                    existing_files = [f['name'] for f in st.session_state.processed_files]
-                    
-                    if uploaded_file.name not in existing_files:
-                        with st.spinner(f"Processing {uploaded_file.name}..."):
+                # Skip files and URLs that were already processed
+                pending_files = [
+                    uf for uf in uploaded_files or []
+                    if uf.name not in st.session_state.processed_names
+                ]
+                pending_url = youtube_url if youtube_url and youtube_url not in st.session_state.processed_names else None
+                
+                with st.spinner(f"Processing {len(pending_files) + (1 if pending_url else 0)} item(s)..."):
+                    # Extract content from all files (and the YouTube URL) concurrently
+                    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+                        futures = {pool.submit(_ingest_one, uf): uf.name for uf in pending_files}
+                        if pending_url:
+                            futures[pool.submit(_ingest_youtube, pending_url)] = pending_url
+                        
+                        for future in as_completed(futures):
                             try:
-                                # Save uploaded file temporarily
-                                temp_path = save_uploaded_file(uploaded_file)
-                                
-                                # Get file type and process
-                                file_type = get_file_type(uploaded_file.name)
-                                content = ""
-                                
-                                if file_type == 'document':
-                                    content = processors['document'].process(temp_path)
-                                elif file_type == 'image':
-                                    content = processors['image'].process(temp_path)
-                                elif file_type == 'audio':
-                                    content = processors['audio'].process(temp_path)
-                                elif file_type == 'video':
-                                    content = processors['video'].process(temp_path)
-                                
-                                if content and len(content.strip()) > 10:
-                                    # Add to vector database
-                                    st.session_state.vector_db.add_document(
-                                        content, 
-                                        metadata={'filename': uploaded_file.name, 'type': file_type}
-                                    )
-                                    
-                                    # Add to processed files
-                                    st.session_state.processed_files.append({
-                                        'name': uploaded_file.name,
-                                        'type': file_type,
-                                        'content_preview': content[:200] + "..." if len(content) > 200 else content
-                                    })
-                                    processed_count += 1
-                                
-                                # Clean up temp file
-                                if os.path.exists(temp_path):
-                                    os.unlink(temp_path)
-                                    
+                                name, file_type, content = future.result()
                             except Exception as e:
-                                st.error(f"Error processing {uploaded_file.name}: {str(e)}")
-                    
-                # Process YouTube URL
-                if youtube_url and youtube_url not in [f['name'] for f in st.session_state.processed_files]:
-                    with st.spinner("Processing YouTube video..."):
-                        try:
-                            content = processors['youtube'].process(youtube_url)
-                            if content:
-                                st.session_state.vector_db.add_document(
-                                    content,
-                                    metadata={'filename': youtube_url, 'type': 'youtube'}
-                                )
-                                
-                                st.session_state.processed_files.append({
-                                    'name': youtube_url,
-                                    'type': 'youtube',
-                                    'content_preview': content[:200] + "..." if len(content) > 200 else content
+                                st.error(f"Error processing {futures[future]}: {str(e)}")
+                                continue
+                            
+                            if content and len(content.strip()) > 10:
+                                # Queue for a single batched insert into the vector database
+                                new_texts.append(content)
+                                new_metadatas.append({'filename': name, 'type': file_type})
+                                new_files.append({
+                                    'name': name,
+                                    'type': file_type,
+                                    'content_preview': make_preview(content)
                                 })
-                                processed_count += 1
-                        except Exception as e:
-                            st.error(f"Error processing YouTube URL: {str(e)}")
+                
+                # Add everything to the vector database in one batch
+                if new_texts:
+                    st.session_state.vector_db.add_documents(new_texts, new_metadatas)
+                    st.session_state.processed_files.extend(new_files)
+                    st.session_state.processed_names.update(f['name'] for f in new_files)
+                processed_count = len(new_files)
                 
                 # Show results
                 if processed_count > 0:
@@ -179,20 +223,10 @@ with st.sidebar:
                         f for f in st.session_state.processed_files 
                         if f['name'] != filename_to_delete
                     ]
+                    st.session_state.processed_names.discard(filename_to_delete)
                     
                     # Remove from vector database
-                    remaining_docs = []
-                    remaining_metadata = []
-                    
-                    for j, metadata in enumerate(st.session_state.vector_db.metadata):
-                        if metadata.get('filename') != filename_to_delete:
-                            remaining_docs.append(st.session_state.vector_db.documents[j])
-                            remaining_metadata.append(metadata)
-                    
-                    # Clear and rebuild database
-                    st.session_state.vector_db.clear_all()
-                    for doc, meta in zip(remaining_docs, remaining_metadata):
-                        st.session_state.vector_db.add_document(doc, meta)
+                    st.session_state.vector_db.delete_by_filename(filename_to_delete)
                     
                     # Store success message in session state
                     type_messages = {
@@ -209,6 +243,7 @@ with st.sidebar:
         
         if st.button("🗑️ Clear All"):
             st.session_state.processed_files = []
+            st.session_state.processed_names = set()
             st.session_state.vector_db.clear_all()
             st.success("All files cleared from database!")
             st.rerun()
@@ -254,19 +289,15 @@ else:
         if query:
             with st.spinner("Searching knowledge base and generating answer..."):
                 try:
-                    # Search for relevant content
-                    results = st.session_state.vector_db.search(query, top_k=3)
+                    # Search and answer, reusing the cached result for repeat queries
+                    answer, results = _cached_answer(
+                        query,
+                        st.session_state.vector_db.corpus_version,
+                        st.session_state.vector_db,
+                        st.session_state.gemini_client
+                    )
                     
                     if results:
-                        # Prepare context for Gemini
-                        context = "\n\n".join([
-                            f"Source: {result['metadata']['filename']}\n{result['content']}" 
-                            for result in results
-                        ])
-                        
-                        # Generate answer using Gemini
-                        answer = st.session_state.gemini_client.answer_question(query, context)
-                        
                         # Display answer
                         st.subheader("🤖 Answer")
                         st.write(answer)
@@ -274,8 +305,8 @@ else:
                         # Display sources
                         st.subheader("📚 Sources")
                         for i, result in enumerate(results, 1):
-                            with st.expander(f"Source {i}: {result['metadata']['filename']} (Score: {result['score']:.3f})"):
-                                st.text(result['content'][:500] + "..." if len(result['content']) > 500 else result['content'])
+                            with st.expander(f"Source {i}: {result.metadata['filename']} (Score: {result.score:.3f})"):
+                                st.text(result.content[:500] + "..." if len(result.content) > 500 else result.content)
                     else:
                         st.warning("No relevant content found for your query. Try rephrasing or adding more content.")
                         
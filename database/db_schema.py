@@ -1,8 +1,15 @@
 import os
+import threading
+from contextlib import contextmanager
 import psycopg2
-from psycopg2.extras import Json
+import psycopg2.pool
+from psycopg2.extras import Json, execute_values
 import pickle
 
+# One connection pool per database URL, shared by every DatabaseSchema in the process
+_pools = {}
+_pools_lock = threading.Lock()
+
 class DatabaseSchema:
     """Manages PostgreSQL database schema and operations"""
     
@@ -10,16 +17,44 @@ class DatabaseSchema:
         self.__database_url = os.getenv("DATABASE_URL")
         if not self.__database_url:
             raise ValueError("DATABASE_URL environment variable is required")
-        self.init_tables()
+        with _pools_lock:
+            self._pool = _pools.get(self.__database_url)
+            created = self._pool is None
+            if created:
+                self._pool = _pools[self.__database_url] = psycopg2.pool.ThreadedConnectionPool(
+                    1, 10, self.__database_url
+                )
+        # Tables only need creating once per process
+        if created:
+            try:
+                self.init_tables()
+            except Exception:
+                self.close()
+                raise
     
+    @contextmanager
     def _get_connection(self):
-        """Get a new database connection"""
-        return psycopg2.connect(self.__database_url)
+        """Borrow a connection from the pool and return it when done"""
+        conn = self._pool.getconn()
+        try:
+            yield conn
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn, close=bool(conn.closed))
+    
+    def close(self):
+        """Close the shared pool's connections; only for process shutdown, as every instance uses it"""
+        with _pools_lock:
+            if _pools.get(self.__database_url) is self._pool:
+                del _pools[self.__database_url]
+        self._pool.closeall()
     
     def init_tables(self):
         """Initialize database tables"""
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
                 # Create documents table
                 cur.execute("""
@@ -32,12 +67,28 @@ class DatabaseSchema:
                     )
                 """)
                 
+                # Short preview of each chunk, computed once on write
+                cur.execute("""
+                    ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_preview TEXT
+                    GENERATED ALWAYS AS (LEFT(content, 200)) STORED
+                """)
+                
                 # Create index on metadata for faster queries
                 cur.execute("""
                     CREATE INDEX IF NOT EXISTS idx_documents_metadata 
                     ON documents USING GIN (metadata)
                 """)
                 
+                # B-tree expression indexes for filename lookups/deletes and per-type stats
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_documents_filename
+                    ON documents ((metadata->>'filename'))
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_documents_type
+                    ON documents ((metadata->>'type'))
+                """)
+                
                 # Create query history table
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS query_history (
@@ -50,13 +101,10 @@ class DatabaseSchema:
                 """)
                 
                 conn.commit()
-        finally:
-            conn.close()
     
     def save_document(self, content: str, metadata: dict, vector: bytes = None):
         """Save a document with its vector to the database"""
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -69,46 +117,119 @@ class DatabaseSchema:
                 doc_id = cur.fetchone()[0]
                 conn.commit()
                 return doc_id
-        finally:
-            conn.close()
     
-    def load_all_documents(self):
-        """Load all documents from the database"""
-        conn = self._get_connection()
-        try:
+    def save_documents_bulk(self, rows: list):
+        """
+        Save many documents in a single transaction
+
+        Args:
+            rows: List of (content, metadata, vector) tuples; vector may be None
+
+        Returns:
+            List of inserted document ids
+        """
+        if not rows:
+            return []
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
+                doc_ids = execute_values(
+                    cur,
+                    "INSERT INTO documents (content, metadata, vector) VALUES %s RETURNING id",
+                    [
+                        (content, Json(metadata), psycopg2.Binary(vector) if vector is not None else None)
+                        for content, metadata, vector in rows
+                    ],
+                    page_size=500,
+                    fetch=True
+                )
+                conn.commit()
+                return [row[0] for row in doc_ids]
+    
+    def iter_all_documents(self, batch: int = 1024):
+        """
+        Stream all documents from the database through a server-side cursor
+        
+        Args:
+            batch: Number of rows fetched from the server per round trip
+            
+        Yields:
+            Dictionaries with id, content and metadata keys
+        """
+        with self._get_connection() as conn:
+            with conn.cursor(name='docs_cur') as cur:
+                cur.itersize = batch
+                # Vectors are derived in-process from the text, so only text and metadata are loaded
                 cur.execute("""
-                    SELECT id, content, metadata, vector
+                    SELECT id, content, metadata
                     FROM documents
-                    ORDER BY created_at
+                    ORDER BY id
+                """)
+                for row in cur:
+                    yield {
+                        'id': row[0],
+                        'content': row[1],
+                        'metadata': row[2]
+                    }
+    
+    def document_fingerprint(self) -> tuple:
+        """
+        Return (row count, highest id) of the stored chunks. Ids only ever grow, so an
+        unchanged fingerprint means the same rows are stored.
+        """
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM documents")
+                count, max_id = cur.fetchone()
+                return (count, max_id)
+    
+    def list_files_with_preview(self):
+        """List each stored file once with its type and a preview of its first chunk"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT DISTINCT ON (metadata->>'filename')
+                        metadata->>'filename',
+                        metadata->>'type',
+                        CASE WHEN LENGTH(content) > 200 OR metadata ? 'total_chunks'
+                            THEN content_preview || '...'
+                            ELSE content_preview
+                        END
+                    FROM documents
+                    WHERE metadata ? 'filename'
+                    ORDER BY metadata->>'filename', id
                 """)
                 rows = cur.fetchall()
                 return [
                     {
-                        'id': row[0],
-                        'content': row[1],
-                        'metadata': row[2],
-                        'vector': row[3]
+                        'name': row[0],
+                        'type': row[1],
+                        'content_preview': row[2]
                     }
                     for row in rows
                 ]
-        finally:
-            conn.close()
     
     def clear_all_documents(self):
         """Clear all documents from the database"""
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("DELETE FROM documents")
                 conn.commit()
-        finally:
-            conn.close()
+    
+    def delete_by_filename(self, filename: str) -> int:
+        """Delete every chunk stored for a filename and return the number of rows removed"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "DELETE FROM documents WHERE metadata->>'filename' = %s",
+                    (filename,)
+                )
+                deleted = cur.rowcount
+                conn.commit()
+                return deleted
     
     def save_query(self, query: str, answer: str, sources: list):
         """Save a query and its answer to history"""
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -121,13 +242,10 @@ class DatabaseSchema:
                 query_id = cur.fetchone()[0]
                 conn.commit()
                 return query_id
-        finally:
-            conn.close()
     
     def get_query_history(self, limit: int = 50):
         """Get recent query history"""
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("""
                     SELECT id, query, answer, sources, created_at
@@ -146,15 +264,10 @@ class DatabaseSchema:
                     }
                     for row in rows
                 ]
-        finally:
-            conn.close()
     
     def clear_query_history(self):
         """Clear all query history"""
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("DELETE FROM query_history")
                 conn.commit()
-        finally:
-            conn.close()
@@ -1,13 +1,48 @@
 import numpy as np
-import faiss
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
-from typing import List, Dict, Any
+from typing import List, Dict, Any, NamedTuple
+import glob
+import hashlib
 import pickle
 import os
+import threading
+import time
+import uuid
 from database.db_schema import DatabaseSchema
+from utils.chunking import chunk_text
+
+class SearchResult(NamedTuple):
+    """A single search hit"""
+    content: str
+    metadata: Dict[str, Any]
+    score: float
+    rank: int
+
+class _NumpyIndex:
+    """Exact inner-product index used when FAISS is not installed"""
+    
+    def __init__(self, embeddings: np.ndarray):
+        self.matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self.ntotal = len(self.matrix)
+    
+    def search(self, queries: np.ndarray, k: int):
+        """Return (scores, indices) for the top k rows, shaped like faiss.Index.search"""
+        k = min(k, self.ntotal)
+        # One BLAS matrix product scores every stored vector
+        scores = queries.astype(np.float32) @ self.matrix.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top_scores, order, axis=1), np.take_along_axis(top, order, axis=1)
 
 class VectorDatabase:
-    """FAISS-based vector database for semantic search with PostgreSQL persistence"""
+    """FAISS HNSW-based vector database for semantic search with PostgreSQL persistence"""
     
     def __init__(self):
         """
@@ -17,7 +52,8 @@ class VectorDatabase:
             max_features=512,
             ngram_range=(1, 2),
             min_df=1,
-            stop_words='english'
+            stop_words='english',
+            dtype=np.float32  # Rows come out L2-normalized (norm='l2'), ready for cosine
         )
         self.dimension = None  # Will be set dynamically
         self.index = None  # Will be created when first document is added
@@ -25,17 +61,43 @@ class VectorDatabase:
         # Store documents and metadata
         self.documents = []
         self.metadata = []
+        self._doc_ids = []  # Database row id per chunk; None when the row was never saved
         self.is_fitted = False
+        self._dirty = False  # Documents changed since the index was last built
+        
+        # GPU resources, created on first use when FAISS sees a CUDA device
+        self._gpu_res = None
+        self._index_on_gpu = False
+        
+        # Corpus identity and revision, used to key cached answers
+        self._corpus_id = uuid.uuid4().hex
+        self._revision = 0
+        
+        # Query embeddings keyed by SHA-256 of the query text; valid for the current fit only
+        self._query_cache = {}
+        self._query_cache_size = 4096
+        
+        # Optional on-disk snapshot of the fitted vectorizer and index (path prefix)
+        self.index_path = os.getenv("VECTOR_INDEX_PATH")
+        self._save_lock = threading.Lock()
         
         # Initialize database (optional for local use)
         self.db = None
         if os.getenv("DATABASE_URL"):
             try:
                 self.db = DatabaseSchema()
-                self._load_from_database()
             except Exception as e:
                 print(f"Warning: Could not initialize database persistence: {e}")
                 self.db = None
+        
+        # Reuse the saved index when it matches the database, otherwise refit from the rows
+        if not self._load_snapshot():
+            self._load_from_database()
+    
+    @property
+    def corpus_version(self) -> str:
+        """Identifier that changes whenever documents are added, deleted or cleared"""
+        return f"{self._corpus_id}:{self._revision}"
     
     def _load_from_database(self):
         """Load existing documents from database"""
@@ -43,18 +105,221 @@ class VectorDatabase:
             return
             
         try:
-            stored_docs = self.db.load_all_documents()
-            if stored_docs:
-                for doc in stored_docs:
-                    self.documents.append(doc['content'])
-                    self.metadata.append(doc['metadata'])
-                
-                # Rebuild index with loaded documents
-                self._rebuild_index()
-                print(f"Loaded {len(stored_docs)} documents from database")
+            loaded = 0
+            for doc in self.db.iter_all_documents():
+                self.documents.append(doc['content'])
+                self.metadata.append(doc['metadata'])
+                self._doc_ids.append(doc['id'])
+                loaded += 1
+            
+            if loaded:
+                # Index is built on first search
+                self._dirty = True
+                print(f"Loaded {loaded} documents from database")
         except Exception as e:
             print(f"Error loading from database: {e}")
     
+    def _snapshot_files(self, path: str, token: str) -> Dict[str, str]:
+        """File names of the index and vectorizer written by one save under a path prefix"""
+        return {
+            'index': f"{path}.{token}.faiss",
+            'vectorizer': f"{path}.{token}.vec.pkl"
+        }
+    
+    def _manifest_file(self, path: str) -> str:
+        """The documents file, which names the index and vectorizer files it belongs with"""
+        return f"{path}.docs.pkl"
+    
+    def _db_fingerprint(self):
+        """
+        (row count, highest row id) of the chunks held in memory, comparable with
+        DatabaseSchema.document_fingerprint(); None if some chunks never reached the database
+        """
+        if None in self._doc_ids:
+            return None
+        return (len(self._doc_ids), max(self._doc_ids, default=0))
+    
+    def _snapshot_state(self) -> Dict[str, Any]:
+        """Capture the fitted state so it can be written while the live objects keep changing"""
+        return {
+            'index': self.index,
+            'on_gpu': self._index_on_gpu,
+            'vectorizer': self.vectorizer,
+            'documents': list(self.documents),
+            'metadata': list(self.metadata),
+            'doc_ids': list(self._doc_ids),
+            'fingerprint': self._db_fingerprint(),
+            'revision': self._revision
+        }
+    
+    def save(self, path: str = None):
+        """
+        Write the FAISS index, fitted vectorizer and documents to disk
+        
+        Args:
+            path: Path prefix for the snapshot files (defaults to VECTOR_INDEX_PATH)
+        """
+        path = path or self.index_path
+        if not path or not FAISS_AVAILABLE:
+            return
+        
+        try:
+            self.flush()
+            if not self.is_fitted:
+                return
+            self._write_snapshot(path, self._snapshot_state())
+        except Exception as e:
+            raise Exception(f"Error saving vector index: {str(e)}")
+    
+    def _save_in_background(self):
+        """Write a snapshot of the current fit on a worker thread, off the search path"""
+        if not FAISS_AVAILABLE:
+            return
+        state = self._snapshot_state()
+        
+        def write():
+            try:
+                self._write_snapshot(self.index_path, state)
+            except Exception as e:
+                print(f"Warning: Error saving vector index: {e}")
+        
+        threading.Thread(target=write, daemon=True).start()
+    
+    def _write_snapshot(self, path: str, state: Dict[str, Any]):
+        """
+        Write a snapshot so that readers see either the previous one or this one, never a mix.
+        The index and vectorizer go to files unique to this save; the documents file that
+        names them is written to a temporary file and renamed into place last.
+        
+        Args:
+            path: Path prefix for the snapshot files
+            state: Fitted state from _snapshot_state()
+        """
+        with self._save_lock:
+            started = time.time()
+            token = uuid.uuid4().hex
+            files = self._snapshot_files(path, token)
+            
+            index = faiss.index_gpu_to_cpu(state['index']) if state['on_gpu'] else state['index']
+            faiss.write_index(index, files['index'])
+            with open(files['vectorizer'], 'wb') as f:
+                pickle.dump(state['vectorizer'], f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            manifest = {
+                'index': os.path.basename(files['index']),
+                'vectorizer': os.path.basename(files['vectorizer']),
+                'fingerprint': state['fingerprint'],
+                'doc_ids': state['doc_ids'],
+                'documents': state['documents'],
+                'metadata': state['metadata']
+            }
+            manifest_file = self._manifest_file(path)
+            temp_file = f"{manifest_file}.{token}.tmp"
+            with open(temp_file, 'wb') as f:
+                pickle.dump(manifest, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            # Documents changed while this was being written; don't publish an outdated snapshot
+            if state['revision'] != self._revision:
+                for f in (temp_file, *files.values()):
+                    self._remove_file(f)
+                return
+            os.replace(temp_file, manifest_file)
+            
+            # Files from earlier saves are no longer referenced
+            self._remove_snapshot_files(path, keep=token, older_than=started)
+    
+    def _load_snapshot(self) -> bool:
+        """
+        Load a snapshot written by save() instead of refitting on startup
+        
+        Returns:
+            True if the snapshot was loaded, False if the caller should rebuild
+        """
+        if not self.index_path or not FAISS_AVAILABLE:
+            return False
+        
+        manifest_file = self._manifest_file(self.index_path)
+        if not os.path.exists(manifest_file):
+            return False
+        
+        try:
+            with open(manifest_file, 'rb') as f:
+                manifest = pickle.load(f)
+            documents = manifest['documents']
+            
+            # A snapshot of different rows than the database holds is stale
+            if self.db and manifest['fingerprint'] != self.db.document_fingerprint():
+                print("Saved vector index is out of date, rebuilding from database")
+                return False
+            
+            directory = os.path.dirname(manifest_file)
+            with open(os.path.join(directory, manifest['vectorizer']), 'rb') as f:
+                vectorizer = pickle.load(f)
+            index_file = os.path.join(directory, manifest['index'])
+            try:
+                # Memory-map the index file rather than reading it into memory
+                index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP)
+            except RuntimeError:
+                index = faiss.read_index(index_file)
+            
+            if index.ntotal != len(documents):
+                print("Saved vector index does not match its documents, rebuilding")
+                return False
+        except Exception as e:
+            print(f"Warning: Could not load saved vector index: {e}")
+            return False
+        
+        self.documents = documents
+        self.metadata = manifest['metadata']
+        self._doc_ids = manifest['doc_ids']
+        self.vectorizer = vectorizer
+        self.index = self._to_gpu(index)
+        self.dimension = index.d
+        self.is_fitted = True
+        self._dirty = False
+        print(f"Loaded {len(documents)} documents from saved vector index")
+        return True
+    
+    def _remove_snapshot(self):
+        """Delete the on-disk snapshot once the in-memory corpus has changed"""
+        if not self.index_path:
+            return
+        # Waits for a snapshot being written, which then sees the new revision or gets removed here
+        with self._save_lock:
+            self._remove_file(self._manifest_file(self.index_path))
+            self._remove_snapshot_files(self.index_path)
+    
+    def _remove_snapshot_files(self, path: str, keep: str = None, older_than: float = None):
+        """
+        Delete index, vectorizer and temporary files left by saves under a path prefix
+        
+        Args:
+            path: Path prefix for the snapshot files
+            keep: Token of a save whose files must stay
+            older_than: Only delete files last modified before this time, so saves that
+                are still being written elsewhere are left alone
+        """
+        prefix = glob.escape(path)
+        for pattern in ('.*.faiss', '.*.vec.pkl', '.docs.pkl.*.tmp'):
+            for f in glob.glob(prefix + pattern):
+                if keep and keep in os.path.basename(f):
+                    continue
+                try:
+                    if older_than is not None and os.path.getmtime(f) >= older_than:
+                        continue
+                except OSError:
+                    continue
+                self._remove_file(f)
+    
+    def _remove_file(self, f: str):
+        """Delete a file if it exists"""
+        try:
+            os.remove(f)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Could not remove saved vector index file {f}: {e}")
+    
     def add_document(self, text: str, metadata: Dict[str, Any] = None):
         """
         Add a document to the vector database and persist to PostgreSQL
@@ -63,62 +328,160 @@ class VectorDatabase:
             text: Document text content
             metadata: Optional metadata dictionary
         """
+        self.add_documents([text], [metadata])
+    
+    def add_documents(self, texts: List[str], metadatas: List[Dict[str, Any]] = None):
+        """
+        Add several documents at once with a single database insert.
+        The index is rebuilt lazily on the next search.
+        
+        Args:
+            texts: Document text contents
+            metadatas: Optional metadata dictionaries, one per text
+        """
         try:
-            # Split text into chunks if it's too long
-            chunks = self._chunk_text(text, max_chunk_size=500)
+            metadatas = metadatas or [None] * len(texts)
+            new_chunks = []
+            new_metadata = []
             
-            for i, chunk in enumerate(chunks):
-                # Store document and metadata
-                chunk_metadata = metadata.copy() if metadata else {}
-                if len(chunks) > 1:
-                    chunk_metadata['chunk_id'] = i
-                    chunk_metadata['total_chunks'] = len(chunks)
-                
-                self.documents.append(chunk)
-                self.metadata.append(chunk_metadata)
+            for text, metadata in zip(texts, metadatas):
+                # Split text into chunks if it's too long
+                chunks = chunk_text(text, max_chunk_size=500)
+                metadata = metadata or {}
                 
-                # Save to database if available
-                if self.db:
-                    try:
-                        self.db.save_document(chunk, chunk_metadata)
-                    except Exception as e:
-                        print(f"Warning: Could not save document to database: {e}")
-            
-            # Rebuild index with all documents
-            self._rebuild_index()
+                new_chunks.extend(chunks)
+                if len(chunks) > 1:
+                    new_metadata.extend(
+                        {**metadata, 'chunk_id': i, 'total_chunks': len(chunks)}
+                        for i in range(len(chunks))
+                    )
+                else:
+                    new_metadata.append(metadata.copy())
+            
+            # Store documents and metadata
+            self.documents.extend(new_chunks)
+            self.metadata.extend(new_metadata)
+            self._revision += 1
+            
+            # Save to database if available
+            new_ids = [None] * len(new_chunks)
+            if self.db:
+                try:
+                    new_ids = self.db.save_documents_bulk([(c, m, None) for c, m in zip(new_chunks, new_metadata)])
+                except Exception as e:
+                    print(f"Warning: Could not save documents to database: {e}")
+            self._doc_ids.extend(new_ids)
+            
+            self._dirty = True
+            self._remove_snapshot()
                 
         except Exception as e:
             raise Exception(f"Error adding document to vector database: {str(e)}")
     
+    def flush(self):
+        """
+        Fit the vectorizer and build the index for all documents added since the last build.
+        Buffered documents are vectorized together in one pass.
+        """
+        if self._dirty:
+            self._rebuild_index()
+    
     def _rebuild_index(self):
-        """Rebuild the FAISS index with all documents"""
+        """Rebuild the FAISS HNSW index with all documents"""
+        self._dirty = False
         if not self.documents:
             return
             
         # Fit vectorizer on all documents
         try:
-            tfidf_matrix = self.vectorizer.fit_transform(self.documents)
+            # Fit a fresh copy so a snapshot still being written keeps the previous fit intact
+            vectorizer = clone(self.vectorizer)
+            tfidf_matrix = vectorizer.fit_transform(self.documents)
+            self.vectorizer = vectorizer
             
-            # Convert to dense numpy array and normalize
-            embeddings = tfidf_matrix.toarray().astype(np.float32)
+            # Rows are already unit length; densify the float32 CSR in a single allocation
+            embeddings = tfidf_matrix.toarray()
             
             # Set dimension based on actual TF-IDF output
             self.dimension = embeddings.shape[1]
             
-            # Normalize for cosine similarity
-            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-            norms[norms == 0] = 1  # Avoid division by zero
-            embeddings = embeddings / norms
-            
-            # Create new FAISS index with correct dimension
-            self.index = faiss.IndexFlatIP(self.dimension)
-            self.index.add(embeddings)
+            self.index = self._to_gpu(self._build_index(np.ascontiguousarray(embeddings)))
             self.is_fitted = True
+            self._query_cache.clear()
             
         except Exception as e:
             raise Exception(f"Error rebuilding index: {str(e)}")
+        
+        # Keep the on-disk snapshot in step so the next startup can skip the refit
+        if self.index_path:
+            self._save_in_background()
     
-    def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def _build_index(self, embeddings: np.ndarray):
+        """
+        Create and populate a FAISS index for normalized embeddings, sized to the corpus
+        
+        Args:
+            embeddings: L2-normalized float32 matrix of shape (N, dimension)
+            
+        Returns:
+            Populated FAISS index (inner product on normalized vectors = cosine)
+        """
+        if not FAISS_AVAILABLE:
+            return _NumpyIndex(embeddings)
+        
+        # Very large corpora: inverted lists over product-quantized codes
+        pq_m = next((m for m in (64, 48, 32, 16, 8) if self.dimension % m == 0), None)
+        if len(embeddings) >= 50000 and pq_m:
+            nlist = int(np.sqrt(len(embeddings)))
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            index = faiss.IndexIVFPQ(
+                quantizer, self.dimension, nlist, pq_m, 8, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(embeddings)
+            index.add(embeddings)
+            return index
+        
+        if len(embeddings) >= 1024:
+            # Large corpora: store 8-bit scalar-quantized codes (4x smaller than float32)
+            index = faiss.IndexHNSWSQ(
+                self.dimension, faiss.ScalarQuantizer.QT_8bit, 32, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(embeddings)
+        else:
+            index = faiss.IndexHNSWFlat(self.dimension, 32, faiss.METRIC_INNER_PRODUCT)
+        
+        index.hnsw.efConstruction = 200
+        index.add(embeddings)
+        return index
+    
+    def _to_gpu(self, index):
+        """
+        Move an index to the first GPU when one is available
+        
+        Args:
+            index: CPU index
+            
+        Returns:
+            GPU copy of the index, or the CPU index if it cannot be moved
+        """
+        self._index_on_gpu = False
+        if not FAISS_AVAILABLE or getattr(faiss, 'get_num_gpus', lambda: 0)() == 0:
+            return index
+        
+        try:
+            if self._gpu_res is None:
+                self._gpu_res = faiss.StandardGpuResources()
+            options = faiss.GpuClonerOptions()
+            options.useFloat16 = True  # Needed for PQ codes with many sub-quantizers
+            gpu_index = faiss.index_cpu_to_gpu(self._gpu_res, 0, index, options)
+        except Exception:
+            # HNSW indexes have no GPU implementation; keep searching on CPU
+            return index
+        
+        self._index_on_gpu = True
+        return gpu_index
+    
+    def search(self, query: str, top_k: int = 5) -> List[SearchResult]:
         """
         Search for similar documents
         
@@ -127,19 +490,23 @@ class VectorDatabase:
             top_k: Number of top results to return
             
         Returns:
-            List of search results with content, metadata, and scores
+            List of SearchResult tuples with content, metadata, score and rank
         """
         try:
+            # Fit once for all documents added since the last search
+            self.flush()
+            
             if len(self.documents) == 0 or not self.is_fitted:
                 return []
             
-            # Transform query using the fitted vectorizer
-            query_vector = self.vectorizer.transform([query]).toarray().astype(np.float32)
+            query_vector = self._embed_query(query)
             
-            # Normalize query vector
-            query_norm = np.linalg.norm(query_vector)
-            if query_norm > 0:
-                query_vector = query_vector / query_norm
+            # Widen the HNSW candidate list for larger result sets
+            if hasattr(self.index, 'hnsw'):
+                self.index.hnsw.efSearch = max(64, top_k * 4)
+            # Number of IVF cells visited per query
+            if hasattr(self.index, 'nprobe'):
+                self.index.nprobe = 16
             
             # Search in FAISS index
             scores, indices = self.index.search(
@@ -147,29 +514,119 @@ class VectorDatabase:
                 min(top_k, len(self.documents))
             )
             
-            # Prepare results
-            results = []
-            for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-                if idx != -1:  # Valid index
-                    results.append({
-                        'content': self.documents[idx],
-                        'metadata': self.metadata[idx],
-                        'score': float(score),
-                        'rank': i + 1
-                    })
-            
-            return results
+            # Drop missing hits (-1) in one vectorized step, then build only the survivors
+            valid = indices[0] != -1
+            return [
+                SearchResult(self.documents[idx], self.metadata[idx], score, rank)
+                for rank, (idx, score) in enumerate(
+                    zip(indices[0][valid].tolist(), scores[0][valid].tolist()), 1
+                )
+            ]
             
         except Exception as e:
             raise Exception(f"Error searching vector database: {str(e)}")
     
+    def list_files_with_preview(self) -> List[Dict[str, str]]:
+        """
+        List stored files with their type and a short content preview
+        
+        Returns:
+            List of dictionaries with name, type and content_preview keys
+        """
+        if self.db:
+            try:
+                return self.db.list_files_with_preview()
+            except Exception as e:
+                print(f"Warning: Could not list files from database: {e}")
+        
+        files = {}
+        for doc, meta in zip(self.documents, self.metadata):
+            name = meta.get('filename')
+            if name and name not in files:
+                files[name] = {
+                    'name': name,
+                    'type': meta.get('type'),
+                    'content_preview': doc[:200] + "..." if len(doc) > 200 or 'total_chunks' in meta else doc
+                }
+        return list(files.values())
+    
+    def delete_by_filename(self, filename: str) -> int:
+        """
+        Remove every chunk of a file from memory and database
+        
+        Args:
+            filename: Filename (or URL) stored in the chunk metadata
+            
+        Returns:
+            Number of chunks removed
+        """
+        keep = [i for i, meta in enumerate(self.metadata) if meta.get('filename') != filename]
+        removed = len(self.metadata) - len(keep)
+        if removed == 0:
+            return 0
+        
+        self.documents = [self.documents[i] for i in keep]
+        self.metadata = [self.metadata[i] for i in keep]
+        self._doc_ids = [self._doc_ids[i] for i in keep]
+        self._revision += 1
+        self._remove_snapshot()
+        
+        if self.db:
+            try:
+                self.db.delete_by_filename(filename)
+            except Exception as e:
+                print(f"Warning: Could not delete document from database: {e}")
+        
+        # TF-IDF weights depend on the whole corpus, so refit on what remains at next search
+        if self.documents:
+            self._dirty = True
+        else:
+            self.index = None
+            self._index_on_gpu = False
+            self.dimension = None
+            self.is_fitted = False
+            self._query_cache.clear()
+        
+        return removed
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        """
+        Vectorize and normalize a query, reusing cached vectors for repeated queries
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Normalized query vector of shape (1, dimension)
+        """
+        key = hashlib.sha256(query.encode('utf-8')).hexdigest()
+        query_vector = self._query_cache.get(key)
+        if query_vector is not None:
+            return query_vector
+        
+        # Transform query using the fitted vectorizer (already L2-normalized float32)
+        query_vector = self.vectorizer.transform([query]).toarray()
+        query_vector.setflags(write=False)
+        
+        # Evict the oldest entry once the cache is full
+        if len(self._query_cache) >= self._query_cache_size:
+            self._query_cache.pop(next(iter(self._query_cache)))
+        self._query_cache[key] = query_vector
+        return query_vector
+    
     def clear_all(self):
         """Clear all documents from memory and database"""
         self.documents = []
         self.metadata = []
+        self._doc_ids = []
         self.index = None
+        self._index_on_gpu = False
         self.dimension = None
         self.is_fitted = False
+        self._dirty = False
+        self._query_cache.clear()
+        self._revision += 1
+        self._remove_snapshot()
         
         if self.db:
             try:
@@ -177,56 +634,6 @@ class VectorDatabase:
             except Exception as e:
                 print(f"Warning: Could not clear database: {e}")
     
-    def _chunk_text(self, text: str, max_chunk_size: int = 500) -> List[str]:
-        """
-        Split text into chunks for better processing
-        
-        Args:
-            text: Input text
-            max_chunk_size: Maximum characters per chunk
-            
-        Returns:
-            List of text chunks
-        """
-        if len(text) <= max_chunk_size:
-            return [text]
-        
-        # Split by paragraphs first
-        paragraphs = text.split('\n\n')
-        chunks = []
-        current_chunk = ""
-        
-        for paragraph in paragraphs:
-            # If adding this paragraph would exceed the limit
-            if len(current_chunk) + len(paragraph) + 2 > max_chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
-                
-                # If paragraph itself is too long, split by sentences
-                if len(paragraph) > max_chunk_size:
-                    sentences = paragraph.split('. ')
-                    temp_chunk = ""
-                    
-                    for sentence in sentences:
-                        if len(temp_chunk) + len(sentence) + 2 > max_chunk_size:
-                            if temp_chunk:
-                                chunks.append(temp_chunk.strip())
-                                temp_chunk = ""
-                        temp_chunk += sentence + ". "
-                    
-                    if temp_chunk:
-                        current_chunk = temp_chunk.strip()
-                else:
-                    current_chunk = paragraph
-            else:
-                current_chunk += "\n\n" + paragraph if current_chunk else paragraph
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        return chunks
-    
     def get_stats(self) -> Dict[str, int]:
         """
         Get database statistics
@@ -234,6 +641,7 @@ class VectorDatabase:
         Returns:
             Dictionary with database stats
         """
+        self.flush()
         return {
             'total_documents': len(self.documents),
             'total_vectors': self.index.ntotal if self.index else 0,
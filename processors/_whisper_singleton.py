@@ -0,0 +1,48 @@
+import threading
+import numpy as np
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WHISPER_AVAILABLE = False
+
+# Model size; also part of the transcript cache key
+WHISPER_MODEL = "tiny"
+
+# One Whisper model per process, shared by every AudioProcessor and VideoProcessor
+_lock = threading.Lock()
+_model = None
+
+def get_whisper():
+    """
+    Load the int8 faster-whisper model on first use and return the shared instance
+    
+    Returns:
+        BatchedInferencePipeline wrapping the tiny Whisper model
+    """
+    global _model
+    if _model is None:
+        with _lock:
+            # Another thread may have finished loading while we waited
+            if _model is None:
+                # int8 weights everywhere; on GPU keep activations in float16 for the tensor cores
+                if ctranslate2.get_cuda_device_count() > 0:
+                    device, compute_type = "cuda", "int8_float16"
+                else:
+                    device, compute_type = "cpu", "int8"
+                model = WhisperModel(WHISPER_MODEL, device=device, compute_type=compute_type)
+                _warm_up(model)
+                _model = BatchedInferencePipeline(model)
+    return _model
+
+def _warm_up(model):
+    """Run one second of silence through the model so the first real file doesn't pay for setup"""
+    try:
+        segments, _ = model.transcribe(
+            np.zeros(16000, dtype=np.float32), language="en", beam_size=1, vad_filter=False
+        )
+        # Segments are produced lazily; decoding only happens when they are consumed
+        list(segments)
+    except Exception as e:
+        print(f"Warning: Whisper warm-up failed: {e}")
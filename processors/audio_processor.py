@@ -1,33 +1,58 @@
-import os
+import hashlib
+import json
+import queue
+import subprocess
 import tempfile
+import threading
+import wave
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
+import numpy as np
 import speech_recognition as sr
-from pydub import AudioSegment
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+from processors._whisper_singleton import WHISPER_AVAILABLE, WHISPER_MODEL, get_whisper
+from utils import gemini_cache
+
+# Frame RMS (int16 units) below which audio counts as silence: about -60 dBFS, far under
+# quiet speech, so only digital silence and near-inaudible hiss are skipped
+SILENCE_RMS = 30
 
 class AudioProcessor:
     """Handles complete audio analysis, speech-to-text, and lyrics extraction"""
     
     def __init__(self):
-        self.recognizer = sr.Recognizer()
-        # Configure recognizer for better music/speech detection
-        self.recognizer.energy_threshold = 300
-        self.recognizer.dynamic_energy_threshold = True
-        self.recognizer.pause_threshold = 0.8
-        self.recognizer.phrase_threshold = 0.3
+        # Recognizers hold mutable state, so each thread gets its own
+        self._local = threading.local()
+        
+        # Recent fallback transcripts keyed by a hash of the chunk's PCM bytes
+        self._chunk_cache = OrderedDict()
+        self._chunk_cache_size = 256
+        self._chunk_cache_lock = threading.Lock()
         
         self.whisper_model = None
         if WHISPER_AVAILABLE:
             try:
-                self.whisper_model = whisper.load_model("tiny")
+                self.whisper_model = get_whisper()
                 print("Whisper tiny model loaded for fast transcription")
             except Exception as e:
                 print(f"Failed to load Whisper: {e}")
     
+    @property
+    def recognizer(self) -> sr.Recognizer:
+        """Speech recognizer for the calling thread"""
+        recognizer = getattr(self._local, 'recognizer', None)
+        if recognizer is None:
+            recognizer = sr.Recognizer()
+            # Configure recognizer for better music/speech detection
+            recognizer.energy_threshold = 300
+            recognizer.dynamic_energy_threshold = True
+            recognizer.pause_threshold = 0.8
+            recognizer.phrase_threshold = 0.3
+            self._local.recognizer = recognizer
+        return recognizer
+    
     def process(self, file_path: str) -> str:
         """
         Complete pin-to-pin audio analysis and text conversion
@@ -38,210 +63,514 @@ class AudioProcessor:
         Returns:
             Complete audio-to-text conversion with full transcript
         """
+        return "".join(self.stream(file_path))
+    
+    def stream(self, file_path: str) -> Iterator[str]:
+        """
+        Same document as process(), yielded piece by piece as transcription progresses
+        
+        Args:
+            file_path: Path to the audio file
+            
+        Yields:
+            The header, then one timestamped transcript line at a time, then the footer
+        """
         try:
             filename = Path(file_path).name
             
-            # Convert to WAV format for processing
-            wav_path = self._convert_to_wav(file_path)
+            # ffprobe only reads the container header, so the header goes out before any decoding
+            metadata = self._get_audio_metadata(file_path)
+            yield self._format_header(filename, metadata)
             
-            try:
-                # Get audio metadata
-                metadata = self._get_audio_metadata(file_path)
-                
-                # Complete pin-to-pin transcription
-                full_transcript = self._complete_audio_to_text(wav_path)
-                
-                # Format as text document
-                result = f"AUDIO FILE ANALYSIS\n"
-                result += f"File: {filename}\n"
-                result += f"Duration: {metadata['duration']} seconds\n"
-                result += f"Format: {metadata['format']}\n"
-                result += f"{'='*50}\n\n"
-                result += f"COMPLETE TRANSCRIPT (Pin-to-Pin):\n\n{full_transcript}\n\n"
-                result += f"{'='*50}\n"
-                result += f"Processing Status: Complete audio-to-text conversion successful"
-                
-                return result
-                
-            finally:
-                # Clean up temporary WAV file
-                if wav_path != file_path and os.path.exists(wav_path):
-                    os.unlink(wav_path)
+            # Complete pin-to-pin transcription, decoded straight from the original file
+            for line in self._iter_transcript(file_path):
+                yield line + "\n"
+            
+            yield self._format_footer()
                     
         except Exception as e:
             raise Exception(f"Error processing audio {file_path}: {str(e)}")
     
-    def _convert_to_wav(self, file_path: str) -> str:
+    def process_batch(self, file_paths: list, workers: int = 4) -> list:
         """
-        Convert audio file to WAV format for speech recognition
+        Process several audio files concurrently. Short clips are transcribed together
+        in a single batched Whisper pass; longer files are transcribed individually.
         
         Args:
-            file_path: Path to original audio file
+            file_paths: Paths to the audio files
+            workers: Number of worker threads
             
         Returns:
-            Path to WAV file
+            List of results in the same order as file_paths; None for files that failed
         """
-        file_extension = Path(file_path).suffix.lower()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            metadata = [pool.submit(self._get_audio_metadata, file_path) for file_path in file_paths]
+            
+            # Clips under 30 s would each leave most of a Whisper batch empty
+            short = []
+            if self.whisper_model and len(file_paths) > 1:
+                durations = [meta.result()['duration'] for meta in metadata]
+                short = [i for i, d in enumerate(durations) if isinstance(d, (int, float)) and d < 30]
+            if len(short) < 2:
+                short = []
+            
+            batch = pool.submit(self._transcribe_clips, [file_paths[i] for i in short]) if short else None
+            transcripts = {
+                i: pool.submit(self._complete_audio_to_text, file_path)
+                for i, file_path in enumerate(file_paths) if i not in short
+            }
+            
+            batched = {}
+            if batch:
+                try:
+                    batched = dict(zip(short, batch.result()))
+                except Exception as e:
+                    print(f"Batched transcription failed: {e}, transcribing clips one by one")
+                    transcripts.update(
+                        (i, pool.submit(self._complete_audio_to_text, file_paths[i])) for i in short
+                    )
+            
+            results = []
+            for i, file_path in enumerate(file_paths):
+                try:
+                    transcript = batched[i] if i in batched else transcripts[i].result()
+                    results.append(self._format_result(
+                        Path(file_path).name, metadata[i].result(), transcript
+                    ))
+                except Exception as e:
+                    print(f"Error processing audio {file_path}: {e}")
+                    results.append(None)
+            return results
+    
+    def _transcribe_clips(self, file_paths: list) -> list:
+        """
+        Transcribe several short clips with one batched Whisper call by joining them
+        into a single 16 kHz stream separated by a second of silence
+        
+        Args:
+            file_paths: Paths to the audio clips
+            
+        Returns:
+            List of transcripts in the same order as file_paths
+        """
+        gap = np.zeros(16000, dtype=np.float32)
+        pieces = []
+        starts = []
+        offset = 0.0
+        for file_path in file_paths:
+            audio = self._load_audio(file_path)
+            starts.append(offset)
+            pieces.extend((audio, gap))
+            offset += (len(audio) + len(gap)) / 16000
         
-        # If already WAV, return as-is
-        if file_extension == '.wav':
-            return file_path
+        segments, _ = self.whisper_model.transcribe(
+            np.concatenate(pieces),
+            language='en',
+            beam_size=1,
+            batch_size=16,
+            without_timestamps=False,
+            vad_filter=True
+        )
         
+        # Hand each segment back to the clip its midpoint falls in, with clip-relative times
+        clip_segments = [[] for _ in file_paths]
+        for segment in segments:
+            i = max(bisect_right(starts, (segment.start + segment.end) / 2) - 1, 0)
+            clip_segments[i].append((segment.start - starts[i], segment.end - starts[i], segment.text))
+        
+        return [
+            self._segments_to_text(segments) or self._transcribe_audio(file_path)
+            for file_path, segments in zip(file_paths, clip_segments)
+        ]
+    
+    def _format_result(self, filename: str, metadata: dict, full_transcript: str) -> str:
+        """
+        Format metadata and transcript as a text document
+        
+        Args:
+            filename: Name of the audio file
+            metadata: Audio metadata dictionary
+            full_transcript: Complete transcript
+            
+        Returns:
+            Text document for the knowledge base
+        """
+        return self._format_header(filename, metadata) + full_transcript + "\n" + self._format_footer()
+    
+    def _format_header(self, filename: str, metadata: dict) -> str:
+        """Document header, ending where the transcript begins"""
+        result = f"AUDIO FILE ANALYSIS\n"
+        result += f"File: {filename}\n"
+        result += f"Duration: {metadata['duration']} seconds\n"
+        result += f"Format: {metadata['format']}\n"
+        result += f"{'='*50}\n\n"
+        result += f"COMPLETE TRANSCRIPT (Pin-to-Pin):\n\n"
+        return result
+    
+    def _format_footer(self) -> str:
+        """Document footer, following the transcript"""
+        result = f"\n{'='*50}\n"
+        result += f"Processing Status: Complete audio-to-text conversion successful"
+        return result
+    
+    def _stream_pcm(self, file_path: str, sample_rate: int = 16000, chunk_seconds: int = 30):
+        """
+        Decode audio with ffmpeg and stream it as mono 16-bit PCM chunks
+        
+        Args:
+            file_path: Path to any audio/video file ffmpeg can read
+            sample_rate: Output sample rate in Hz
+            chunk_seconds: Length of each yielded chunk in seconds
+            
+        Yields:
+            Raw little-endian int16 PCM bytes, chunk_seconds long (the last may be shorter)
+        """
+        # WAVs already in the target layout are read as-is, without starting ffmpeg
+        if self._is_pcm16_mono_wav(file_path, sample_rate):
+            with wave.open(file_path, 'rb') as wav:
+                frames = sample_rate * chunk_seconds
+                while True:
+                    chunk = wav.readframes(frames)
+                    if not chunk:
+                        break
+                    yield chunk
+            return
+        
+        # stderr goes to a temp file rather than a pipe: nothing reads it until ffmpeg
+        # exits, and a full pipe would block ffmpeg mid-decode
+        errors = tempfile.TemporaryFile()
         try:
-            # Load audio file with pydub
-            if file_extension == '.mp3':
-                audio = AudioSegment.from_mp3(file_path)
-            else:
-                audio = AudioSegment.from_file(file_path)
+            proc = subprocess.Popen(
+                ['ffmpeg', '-nostdin', '-loglevel', 'error', '-i', file_path,
+                 '-vn', '-f', 's16le', '-ac', '1', '-ar', str(sample_rate), '-'],
+                stdout=subprocess.PIPE,
+                stderr=errors
+            )
+        except Exception:
+            errors.close()
+            raise
+        chunk_bytes = sample_rate * 2 * chunk_seconds
+        
+        # Read ahead on a separate thread so decoding overlaps with recognition;
+        # the bounded queue caps how far ffmpeg can run ahead
+        chunks = queue.Queue(maxsize=4)
+        stop = threading.Event()
+        
+        def put(item):
+            # Give up once the consumer has stopped, instead of blocking on a full queue
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+        
+        def reader():
+            try:
+                while not stop.is_set():
+                    chunk = proc.stdout.read(chunk_bytes)
+                    if not chunk:
+                        break
+                    put(chunk)
+            finally:
+                put(None)
+        
+        thread = threading.Thread(target=reader, daemon=True)
+        thread.start()
+        produced = False
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                produced = True
+                yield chunk
             
-            # Convert to WAV
-            wav_path = file_path.rsplit('.', 1)[0] + '_temp.wav'
-            audio.export(wav_path, format="wav")
+            proc.wait()
+            if proc.returncode != 0 and not produced:
+                errors.seek(0)
+                error = errors.read().decode('utf-8', errors='replace').strip()
+                raise Exception(f"ffmpeg could not decode audio: {error}")
+        finally:
+            # Stop ffmpeg and the reader if the consumer gave up early
+            stop.set()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            thread.join()
+            proc.stdout.close()
+            errors.close()
+    
+    def _load_audio(self, file_path: str) -> np.ndarray:
+        """
+        Decode a whole file into the float32 mono 16 kHz array Whisper consumes
+        
+        Args:
+            file_path: Path to an audio or video file
             
-            return wav_path
+        Returns:
+            Samples scaled to [-1, 1)
+        """
+        pcm = b"".join(self._stream_pcm(file_path, sample_rate=16000))
+        return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    
+    def _is_pcm16_mono_wav(self, file_path: str, sample_rate: int) -> bool:
+        """
+        Check whether a file is an uncompressed 16-bit mono WAV at the given sample rate
+        
+        Args:
+            file_path: Path to audio file
+            sample_rate: Expected sample rate in Hz
             
-        except Exception as e:
-            raise Exception(f"Error converting audio to WAV: {str(e)}")
+        Returns:
+            True if the PCM frames can be used without decoding
+        """
+        if Path(file_path).suffix.lower() != '.wav':
+            return False
+        try:
+            with wave.open(file_path, 'rb') as wav:
+                return (
+                    wav.getframerate() == sample_rate
+                    and wav.getnchannels() == 1
+                    and wav.getsampwidth() == 2
+                )
+        except (wave.Error, EOFError, OSError):
+            return False
     
-    def _transcribe_audio(self, wav_path: str) -> str:
+    def _transcribe_audio(self, file_path: str) -> str:
         """
-        Transcribe WAV audio file using speech recognition in chunks
+        Transcribe an audio file with Google Speech Recognition in streamed chunks.
+        Used only when Whisper is unavailable or fails.
         
         Args:
-            wav_path: Path to WAV file
+            file_path: Path to audio file
             
         Returns:
             Transcribed text
         """
         try:
-            # Load audio with pydub to get duration and split into chunks
-            audio = AudioSegment.from_wav(wav_path)
-            duration_ms = len(audio)
-            
-            # Try Whisper first for complete transcription
-            if self.whisper_model:
-                try:
-                    result = self.whisper_model.transcribe(wav_path, fp16=False)
-                    return result["text"].strip()
-                except Exception as e:
-                    print(f"Whisper failed: {e}, using enhanced Google Speech Recognition")
-            
-            # If audio is short (< 60 seconds), transcribe as one piece
-            if duration_ms < 60000:
-                return self._transcribe_chunk(wav_path)
-            
-            # For longer audio, split into 30-second chunks for speed
-            chunk_length_ms = 30000  # 30 seconds
             transcripts = []
             
-            for i in range(0, duration_ms, chunk_length_ms):
-                chunk = audio[i:i + chunk_length_ms]
-                
-                # Export chunk to temporary file
-                chunk_path = wav_path.rsplit('.', 1)[0] + f'_chunk_{i//chunk_length_ms}.wav'
-                chunk.export(chunk_path, format="wav")
-                
-                try:
-                    # Transcribe chunk
-                    chunk_transcript = self._transcribe_chunk(chunk_path)
-                    if chunk_transcript and chunk_transcript != "Could not understand audio content":
-                        transcripts.append(chunk_transcript)
-                finally:
-                    # Clean up chunk file
-                    if os.path.exists(chunk_path):
-                        os.unlink(chunk_path)
+            def collect(future):
+                chunk_transcript = future.result()
+                if chunk_transcript and chunk_transcript != "Could not understand audio content":
+                    transcripts.append(chunk_transcript)
+            
+            # Stream 30-second chunks straight from ffmpeg; nothing is written to disk.
+            # Several chunks are uploaded at once, with a bounded window so memory stays flat.
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                pending = deque()
+                for pcm in self._stream_pcm(file_path, sample_rate=16000, chunk_seconds=30):
+                    # Don't upload chunks with no voiced frame at all
+                    if self._is_silent(pcm):
+                        continue
+                    pending.append(pool.submit(self._transcribe_chunk, sr.AudioData(pcm, 16000, 2)))
+                    if len(pending) >= 8:
+                        collect(pending.popleft())
+                while pending:
+                    collect(pending.popleft())
             
             return " ".join(transcripts) if transcripts else "Could not understand audio content"
                     
         except Exception as e:
             raise Exception(f"Error transcribing audio: {str(e)}")
     
-    def _transcribe_chunk(self, wav_path: str) -> str:
+    def _is_silent(self, pcm: bytes, frame_ms: int = 30) -> bool:
+        """
+        Energy-based voice activity check for a 16 kHz PCM16 chunk
+        
+        Args:
+            pcm: Raw little-endian int16 mono samples
+            frame_ms: Frame length the energy is measured over
+            
+        Returns:
+            True if no frame is louder than SILENCE_RMS
+        """
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        frame = 16 * frame_ms
+        usable = len(samples) - len(samples) % frame
+        if usable == 0:
+            return True
+        frames = samples[:usable].astype(np.float32).reshape(-1, frame)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        # An absolute floor rather than the recognizer's energy_threshold, which is tuned for
+        # live microphones and would throw away quiet but voiced recordings
+        return bool(rms.max() < SILENCE_RMS)
+    
+    def _transcribe_chunk(self, audio_data: sr.AudioData) -> str:
         """
         Transcribe a single audio chunk with enhanced settings
         
         Args:
-            wav_path: Path to WAV file chunk
+            audio_data: Audio chunk to recognize
             
         Returns:
             Transcribed text for the chunk
         """
+        key = hashlib.blake2b(audio_data.frame_data, digest_size=16).digest()
+        with self._chunk_cache_lock:
+            if key in self._chunk_cache:
+                self._chunk_cache.move_to_end(key)
+                return self._chunk_cache[key]
+        
         try:
-            with sr.AudioFile(wav_path) as source:
-                # Enhanced noise adjustment for music
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                
-                # Record the audio with offset to skip silence
-                audio_data = self.recognizer.record(source, offset=0.1)
-                
-                # Try multiple recognition methods
-                methods = [
-                    ('Google', lambda: self.recognizer.recognize_google(audio_data, language='en-US')),
-                    ('Google (Hindi)', lambda: self.recognizer.recognize_google(audio_data, language='hi-IN')),
-                ]
-                
-                for method_name, method in methods:
-                    try:
-                        transcript = method()
-                        if transcript and len(transcript.strip()) > 0:
-                            return transcript
-                    except sr.UnknownValueError:
-                        continue
-                    except sr.RequestError as e:
-                        print(f"{method_name} recognition failed: {e}")
-                        continue
-                
-                return "[Audio content detected but could not transcribe clearly]"
+            # Try multiple recognition methods
+            methods = [
+                ('Google', lambda: self.recognizer.recognize_google(audio_data, language='en-US')),
+                ('Google (Hindi)', lambda: self.recognizer.recognize_google(audio_data, language='hi-IN')),
+            ]
+            
+            def attempt(method_name, method):
+                try:
+                    transcript = method()
+                    if transcript and len(transcript.strip()) > 0:
+                        return transcript
+                except sr.UnknownValueError:
+                    pass
+                except sr.RequestError as e:
+                    print(f"{method_name} recognition failed: {e}")
+                return None
+            
+            # English first; Hindi is only requested when English fails or comes back empty
+            for method_name, method in methods:
+                transcript = attempt(method_name, method)
+                if transcript:
+                    # Only successful transcripts are cached; failures may be transient
+                    with self._chunk_cache_lock:
+                        self._chunk_cache[key] = transcript
+                        if len(self._chunk_cache) > self._chunk_cache_size:
+                            self._chunk_cache.popitem(last=False)
+                    return transcript
+            
+            return "[Audio content detected but could not transcribe clearly]"
                     
         except Exception as e:
             return f"Error transcribing chunk: {str(e)}"
     
-    def _complete_audio_to_text(self, wav_path: str) -> str:
+    def _complete_audio_to_text(self, file_path: str) -> str:
         """
         Complete pin-to-pin audio-to-text conversion
         
         Args:
-            wav_path: Path to WAV file
+            file_path: Path to audio file (any format ffmpeg can decode)
             
         Returns:
             Complete transcribed text from entire audio
         """
+        return "\n".join(self._iter_transcript(file_path))
+    
+    def _iter_transcript(self, file_path: str) -> Iterator[str]:
+        """
+        Transcribe an audio file, yielding each Whisper segment as soon as it is decoded
+        
+        Args:
+            file_path: Path to audio file (any format ffmpeg can decode)
+            
+        Yields:
+            Timestamped transcript lines, or the whole fallback transcript as one item
+        """
         # Primary Method: Whisper for complete transcription
         if self.whisper_model:
+            # Identical audio bytes give the same transcript, so replay a cached one
+            cache_key = gemini_cache.make_key('transcript', WHISPER_MODEL, file_path) if gemini_cache.enabled() else None
+            cached = gemini_cache.lookup(cache_key) if cache_key else None
+            if cached:
+                # Older entries stored {'duration', 'lines'}; only the lines are used
+                yield from cached['lines'] if isinstance(cached, dict) else cached
+                return
+            
+            lines = []
+            produced = False
             try:
                 print("Processing complete audio with Whisper...")
-                result = self.whisper_model.transcribe(
-                    wav_path, 
-                    fp16=False, 
+                # VAD splits the audio into speech segments that are decoded in batches
+                segments, _ = self.whisper_model.transcribe(
+                    self._load_audio(file_path),
                     language='en',  # Fixed language for speed
-                    word_timestamps=False,  # Disable for speed
-                    verbose=False,
-                    condition_on_previous_text=False  # Faster processing
+                    beam_size=1,
+                    batch_size=16,
+                    without_timestamps=False,
+                    vad_filter=True
                 )
                 
-                # Get complete text with timestamps if available
-                if 'segments' in result:
-                    segments_text = []
-                    for segment in result['segments']:
-                        start_time = int(segment['start'])
-                        end_time = int(segment['end'])
-                        text = segment['text'].strip()
-                        segments_text.append(f"[{start_time:02d}:{start_time%60:02d}-{end_time:02d}:{end_time%60:02d}] {text}")
-                    
-                    complete_text = "\n".join(segments_text)
-                    if len(complete_text) > 50:
-                        return complete_text
-                
-                # Fallback to simple text
-                text = result["text"].strip()
-                if len(text) > 20:
-                    return text
+                for start, end, text in self._collapse_repeats(
+                    (segment.start, segment.end, segment.text) for segment in segments
+                ):
+                    produced = True
+                    lines.append(self._format_segment(start, end, text))
+                    yield lines[-1]
                     
             except Exception as e:
+                # Lines already handed out cannot be taken back
+                if produced:
+                    raise Exception(f"Error transcribing audio: {str(e)}")
                 print(f"Whisper failed: {e}, using fallback method")
+            
+            if produced:
+                if cache_key:
+                    gemini_cache.store(cache_key, lines)
+                return
         
         # Fallback: Enhanced chunk processing
-        return self._transcribe_audio(wav_path)
+        yield self._transcribe_audio(file_path)
+    
+    def _collapse_repeats(self, segments, min_seconds: float = 3.0) -> Iterator[tuple]:
+        """
+        Merge runs of consecutive identical long segments, which Whisper tends to hallucinate
+        over music and silence, into one segment spanning the run. Short segments are kept
+        as they are, so genuinely repeated lyric or dialogue lines survive.
+        
+        Args:
+            segments: Iterable of (start seconds, end seconds, text) tuples
+            min_seconds: Segments must last longer than this to be merged
+            
+        Yields:
+            (start, end, text) tuples with empty segments dropped; merged runs end in '[repeated Nx]'
+        """
+        run = None
+        count = 0
+        for start, end, text in segments:
+            text = text.strip()
+            if not text:
+                continue
+            long_segment = end - start > min_seconds
+            if run and long_segment and text == run[2]:
+                run = (run[0], end, text)
+                count += 1
+                continue
+            if run:
+                yield run[0], run[1], run[2] + (f" [repeated {count}x]" if count > 1 else "")
+                run = None
+            if long_segment:
+                run = (start, end, text)
+                count = 1
+            else:
+                yield start, end, text
+        if run:
+            yield run[0], run[1], run[2] + (f" [repeated {count}x]" if count > 1 else "")
+    
+    def _format_segment(self, start: float, end: float, text: str) -> str:
+        """Format one transcript segment as '[mm:ss-mm:ss] text'"""
+        start_time = int(start)
+        end_time = int(end)
+        return f"[{start_time//60:02d}:{start_time%60:02d}-{end_time//60:02d}:{end_time%60:02d}] {text}"
+    
+    def _segments_to_text(self, segments) -> str:
+        """
+        Join Whisper segments into a timestamped transcript
+        
+        Args:
+            segments: Iterable of (start seconds, end seconds, text) tuples
+            
+        Returns:
+            Timestamped transcript, one line per segment as _iter_transcript yields them,
+            or None if no segment has text
+        """
+        lines = [
+            self._format_segment(start, end, text)
+            for start, end, text in self._collapse_repeats(segments)
+        ]
+        return "\n".join(lines) if lines else None
     
     def _get_audio_metadata(self, file_path: str) -> dict:
         """
@@ -254,12 +583,22 @@ class AudioProcessor:
             Dictionary with audio metadata
         """
         try:
-            audio = AudioSegment.from_file(file_path)
+            # Read the container header with ffprobe instead of decoding the whole file
+            probe = subprocess.run(
+                ['ffprobe', '-v', 'error', '-select_streams', 'a:0',
+                 '-show_entries', 'format=duration:stream=channels,sample_rate',
+                 '-of', 'json', file_path],
+                capture_output=True,
+                check=True,
+                text=True
+            )
+            info = json.loads(probe.stdout)
+            stream = info['streams'][0]
             return {
-                'duration': len(audio) / 1000,  # Convert to seconds
+                'duration': float(info['format']['duration']),
                 'format': Path(file_path).suffix.upper().replace('.', ''),
-                'channels': audio.channels,
-                'sample_rate': audio.frame_rate
+                'channels': stream['channels'],
+                'sample_rate': int(stream['sample_rate'])
             }
         except Exception:
             return {
@@ -279,10 +618,6 @@ class AudioProcessor:
         Returns:
             True if likely music, False if likely speech
         """
-        try:
-            audio = AudioSegment.from_wav(wav_path)
-            # Simple heuristic: music tends to be longer and have more consistent volume
-            duration = len(audio) / 1000
-            return duration > 30  # Assume files > 30 seconds are likely music
-        except Exception:
-            return False
+        # Simple heuristic: music tends to be longer and have more consistent volume
+        duration = self._get_audio_metadata(wav_path)['duration']
+        return isinstance(duration, float) and duration > 30  # Assume files > 30 seconds are likely music
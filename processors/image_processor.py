@@ -2,6 +2,15 @@ import os
 from pathlib import Path
 from PIL import Image
 from utils.gemini_client import GeminiClient
+from utils import gemini_cache
+
+# Formats Gemini accepts as-is, by extension
+GEMINI_IMAGE_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp'
+}
 
 class ImageProcessor:
     """Handles processing of image files using Gemini Vision"""
@@ -24,39 +33,56 @@ class ImageProcessor:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Image file not found: {file_path}")
             
-            # Convert to JPEG if needed (Gemini works best with JPEG)
-            processed_path = self._ensure_jpeg(file_path)
+            # Reuse the analysis of identical image bytes instead of calling Gemini again
+            description = gemini_cache.cached_call(
+                'image', self.gemini_client.vision_model, file_path,
+                lambda: self._analyze(file_path)
+            )
             
-            try:
-                # Use Gemini to analyze the image
-                description = self.gemini_client.analyze_image(processed_path)
-                
-                # Add file metadata to description
-                filename = Path(file_path).name
-                return f"Image: {filename}\n\nAnalysis:\n{description}"
-                
-            finally:
-                # Clean up temporary file if it was created
-                if processed_path != file_path and os.path.exists(processed_path):
-                    os.unlink(processed_path)
+            # Add file metadata to description
+            filename = Path(file_path).name
+            return f"Image: {filename}\n\nAnalysis:\n{description}"
                     
         except Exception as e:
             raise Exception(f"Error processing image {file_path}: {str(e)}")
     
+    def _analyze(self, file_path: str) -> str:
+        """
+        Describe an image with Gemini, converting it first if needed
+        
+        Args:
+            file_path: Path to the image file
+            
+        Returns:
+            Gemini's description of the image
+        """
+        # Convert to JPEG only if Gemini can't read the format directly
+        processed_path = self._ensure_jpeg(file_path)
+        mime_type = GEMINI_IMAGE_MIME_TYPES[Path(processed_path).suffix.lower()]
+        
+        try:
+            # Use Gemini to analyze the image
+            return self.gemini_client.analyze_image(processed_path, mime_type=mime_type)
+            
+        finally:
+            # Clean up temporary file if it was created
+            if processed_path != file_path and os.path.exists(processed_path):
+                os.unlink(processed_path)
+    
     def _ensure_jpeg(self, file_path: str) -> str:
         """
-        Convert image to JPEG format if needed
+        Convert image to JPEG format if Gemini does not accept it natively
         
         Args:
             file_path: Path to original image
             
         Returns:
-            Path to JPEG image (same as input if already JPEG)
+            Path to JPEG image (same as input if already JPEG, PNG or WebP)
         """
         file_extension = Path(file_path).suffix.lower()
         
-        # If already JPEG, return as-is
-        if file_extension in ['.jpg', '.jpeg']:
+        # If already in a format Gemini reads, return as-is
+        if file_extension in GEMINI_IMAGE_MIME_TYPES:
             return file_path
         
         try:
@@ -75,7 +101,7 @@ class ImageProcessor:
                 
                 # Save as JPEG
                 temp_path = file_path.rsplit('.', 1)[0] + '_temp.jpg'
-                img.save(temp_path, 'JPEG', quality=95)
+                img.save(temp_path, 'JPEG', quality=85)
                 return temp_path
                 
         except Exception as e:
@@ -1,6 +1,6 @@
-import os
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 from moviepy.video.io.VideoFileClip import VideoFileClip
 from processors.audio_processor import AudioProcessor
 from utils.gemini_client import GeminiClient
@@ -8,8 +8,12 @@ from utils.gemini_client import GeminiClient
 class VideoProcessor:
     """Handles processing of video files for content extraction"""
     
-    def __init__(self):
-        self.audio_processor = AudioProcessor()
+    def __init__(self, audio_processor: AudioProcessor = None):
+        """
+        Args:
+            audio_processor: Shared AudioProcessor to transcribe with; one is created if omitted
+        """
+        self.audio_processor = audio_processor or AudioProcessor()
         self.gemini_client = GeminiClient()
     
     def process(self, file_path: str) -> str:
@@ -22,88 +26,84 @@ class VideoProcessor:
         Returns:
             Complete video-to-text conversion with full transcript
         """
+        return "".join(self.stream(file_path))
+    
+    def stream(self, file_path: str) -> Iterator[str]:
+        """
+        Same document as process(), yielded piece by piece as transcription progresses
+        
+        Args:
+            file_path: Path to the video file
+            
+        Yields:
+            The header, then one timestamped transcript line at a time, then the footer
+        """
         try:
             filename = Path(file_path).name
+            print(f"Processing video: {filename}")
             
-            # Step 1: Extract video metadata
-            video_metadata = self._get_video_metadata(file_path)
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                # Step 1: Extract video metadata on a worker while transcription starts here
+                metadata_future = pool.submit(self._get_video_metadata, file_path)
+                
+                # Step 2: Extract audio from video and convert to text (pin-to-pin)
+                lines = self._extract_and_transcribe_audio_complete(file_path)
+                transcript_error = None
+                try:
+                    first_line = next(lines, None)
+                except Exception as e:
+                    first_line, transcript_error = None, e
+                
+                video_metadata = metadata_future.result()
             
-            # Step 2: Extract audio from video and convert to text (pin-to-pin)
-            print(f"Processing video: {filename}")
-            print("Step 1: Extracting audio from video...")
-            audio_transcript = self._extract_and_transcribe_audio_complete(file_path)
+            # Check if video has audio
+            if video_metadata['has_audio'] is False:
+                lines.close()
+                lines = iter(())
+                first_line = "No audio track found in video - video contains no sound"
+            elif transcript_error:
+                raise transcript_error
             
-            # Step 3: Format as complete text document
             result = f"VIDEO FILE ANALYSIS\n"
             result += f"File: {filename}\n"
             result += f"Duration: {video_metadata['duration']} seconds\n"
             result += f"Resolution: {video_metadata['resolution']}\n"
             result += f"{'='*50}\n\n"
-            result += f"COMPLETE TRANSCRIPT (Video -> Audio -> Text):\n\n{audio_transcript}\n\n"
-            result += f"{'='*50}\n"
-            result += f"Processing Status: Complete video-to-text conversion successful"
+            result += f"COMPLETE TRANSCRIPT (Video -> Audio -> Text):\n\n"
+            yield result
             
-            return result
+            if first_line is not None:
+                yield first_line + "\n"
+            for line in lines:
+                yield line + "\n"
+            
+            result = f"\n{'='*50}\n"
+            result += f"Processing Status: Complete video-to-text conversion successful"
+            yield result
                 
         except Exception as e:
             raise Exception(f"Error processing video {file_path}: {str(e)}")
     
-    def _extract_and_transcribe_audio_complete(self, video_path: str) -> str:
+    def _extract_and_transcribe_audio_complete(self, video_path: str) -> Iterator[str]:
         """
         Complete video-to-audio-to-text conversion (pin-to-pin)
         
         Args:
             video_path: Path to video file
             
-        Returns:
-            Complete audio transcript from video
+        Yields:
+            Transcript lines as they are decoded
         """
-        temp_audio_path = None
-        video = None
         try:
-            print("Step 2: Loading video file...")
-            video = VideoFileClip(video_path)
-            
-            # Check if video has audio
-            if video.audio is None:
-                return "No audio track found in video - video contains no sound"
-            
-            print("Step 3: Extracting audio track...")
-            # Create temporary audio file
-            temp_audio_path = video_path.rsplit('.', 1)[0] + '_temp_audio.wav'
-            
-            # Extract complete audio to temporary file with optimized settings
-            video.audio.write_audiofile(
-                temp_audio_path, 
-                logger=None, 
-                verbose=False,
-                codec='pcm_s16le',  # Fast codec
-                ffmpeg_params=["-ac", "1", "-ar", "16000"]  # Mono, 16kHz for speed
-            )
-            
-            print("Step 4: Converting audio to text (pin-to-pin)...")
-            # Use complete audio-to-text conversion
-            transcript = self.audio_processor._complete_audio_to_text(temp_audio_path)
+            print("Step 2: Converting audio to text (pin-to-pin)...")
+            # The audio track is decoded straight from the video while it is transcribed,
+            # so no intermediate WAV is written
+            yield from self.audio_processor._iter_transcript(video_path)
             
-            print("Step 5: Video-to-text conversion complete!")
-            return transcript
+            print("Step 3: Video-to-text conversion complete!")
             
         except Exception as e:
             raise Exception(f"Error in video-to-text conversion: {str(e)}")
-        finally:
-            # Close video file
-            if video:
-                try:
-                    video.close()
-                except:
-                    pass
-            
-            # Clean up temporary audio file
-            if temp_audio_path and os.path.exists(temp_audio_path):
-                try:
-                    os.unlink(temp_audio_path)
-                except:
-                    pass
     
     def _get_video_metadata(self, video_path: str) -> dict:
         """
@@ -1,14 +1,193 @@
+import html
+import os
 import re
-from pytube import YouTube
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
-import requests
-from bs4 import BeautifulSoup
+import threading
+import time
 import json
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import quote
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+try:
+    import lxml
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# The C parser is several times faster than the pure-Python one
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+logger = logging.getLogger(__name__)
+
+# Cache lifetimes in seconds
+INFO_TTL = 86400
+TRANSCRIPT_TTL = 7 * 86400
+LYRICS_TTL = 30 * 86400
+# Misses are remembered for less time, since the lyrics API may just have been down
+LYRICS_MISS_TTL = 86400
+
+# Videos longer than this are assumed not to be songs
+MAX_SONG_SECONDS = 600
+# Song lyrics rarely run past this; lecture transcripts routinely do
+MAX_LYRICS_TRANSCRIPT_CHARS = 3000
+
+# Metadata, transcripts and lyrics keyed by video ID / song, shared across sessions;
+# opened on first use so importing the module doesn't create the cache directory
+_cache_lock = threading.Lock()
+_cache = None
+_cache_opened = False
+
+def _get_cache():
+    """
+    Open the shared diskcache on first use and return it
+    
+    Returns:
+        The diskcache.Cache, or None when diskcache is missing or the cache could not be opened
+    """
+    global _cache, _cache_opened
+    if not _cache_opened:
+        with _cache_lock:
+            # Another thread may have opened it while we waited
+            if not _cache_opened:
+                if DISKCACHE_AVAILABLE:
+                    try:
+                        _cache = diskcache.Cache(os.getenv("YOUTUBE_CACHE_DIR", "./.youtube_cache"))
+                    except Exception as e:
+                        logger.warning("Could not open YouTube cache: %s", e)
+                _cache_opened = True
+    return _cache
+
+# Linear-time RE2 for patterns run on user-supplied URLs and titles, when installed
+_compile = re2.compile if RE2_AVAILABLE else re.compile
+
+# Video ID after "v=" or any "/" (watch, embed/, youtu.be/, shorts/), or a bare ID
+_VIDEO_ID_RE = _compile(r'(?:v=|/)([0-9A-Za-z_-]{11})|^([0-9A-Za-z_-]{11})$')
+
+# Watch-page tags read for metadata, matched on the raw bytes
+_INFO_TAGS = {
+    'title': re.compile(rb'<meta property="og:title" content="([^"]*)"'),
+    'channel': re.compile(rb'<link itemprop="name" content="([^"]*)"'),
+    'description': re.compile(rb'<meta property="og:description" content="([^"]*)"'),
+    'duration': re.compile(rb'<meta itemprop="duration" content="([^"]*)"')
+}
+
+# ISO 8601 durations as used on watch pages, e.g. PT1H2M3S
+_ISO_DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
+
+# Channels whose uploads are talks rather than songs
+_NON_MUSIC_CHANNEL_RE = re.compile(r'\b(news|podcast|ted|lecture|university)\b', re.IGNORECASE)
+
+# Everything stripped from titles and channel names before a lyrics search, in one pass:
+# bracketed asides, a " - Official ..." style tail, video/quality words and a VEVO suffix
+_STRIP_RE = _compile(
+    r'(?i)\([^)]*\)|\[[^\]]*\]'
+    r'|-\s*(?:official|music|video|lyric|audio|ft\.|feat\.|featuring).*$'
+    r'|\b(?:official|music|video|lyrics?|audio|featuring|4K|HD|HQ|remaster(?:ed)?)\b|\b(?:ft|feat)\.'
+    r'|VEVO\b'
+)
+_RE_SPACES = re.compile(r'\s+')
 
 class YouTubeProcessor:
     """Handles processing of YouTube videos for transcript extraction"""
     
+    def __init__(self):
+        # HTTP and parsing libraries are imported where they're used, so importing this
+        # module (e.g. just for _extract_video_id) stays cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        # One pooled session so repeat requests to the same host reuse the TLS connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        
+        # Fetches currently running, so concurrent requests for the same video share one
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Artist/title pairs Lyrics.ovh answered 404 for, most recent last
+        self._ovh_missing = OrderedDict()
+        self._ovh_missing_size = 1024
+    
+    def close(self):
+        """Release pooled HTTP connections"""
+        self._session.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop every cached video, transcript and lyrics lookup"""
+        cache = _get_cache()
+        if cache is not None:
+            cache.clear()
+    
+    def _cache_get(self, key: str):
+        """Return the cached value for key, or None"""
+        cache = _get_cache()
+        if cache is None:
+            return None
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning("Could not read YouTube cache: %s", e)
+            return None
+    
+    def _cache_set(self, key: str, value, expire: int):
+        """Store a value for expire seconds"""
+        cache = _get_cache()
+        if cache is None:
+            return
+        try:
+            cache.set(key, value, expire=expire)
+        except Exception as e:
+            logger.warning("Could not write YouTube cache: %s", e)
+    
+    def _single_flight(self, key: str, fetch, *args):
+        """
+        Run fetch(*args) unless the same key is already being fetched, in which case
+        wait for that result instead
+        
+        Args:
+            key: Identifies the fetch, e.g. 'transcript:<video_id>'
+            fetch: Function to call
+            *args: Arguments for fetch
+            
+        Returns:
+            The result of fetch
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        
+        if owner:
+            try:
+                future.set_result(fetch(*args))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    del self._inflight[key]
+        return future.result()
+    
     def process(self, youtube_url: str) -> str:
         """
         Process a YouTube URL and extract content
@@ -28,14 +207,22 @@ class YouTubeProcessor:
                 else:
                     raise ValueError("Invalid YouTube URL. Please use format: https://www.youtube.com/watch?v=VIDEO_ID")
             
-            # Get video metadata
-            video_info = self._get_video_info(youtube_url)
-            
-            # Get transcript
-            transcript = self._get_transcript(video_id)
+            # Metadata and transcript are independent requests, so fetch them together
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                info_future = pool.submit(self._single_flight, f"info:{video_id}", self._get_video_info, youtube_url)
+                transcript_future = pool.submit(self._single_flight, f"transcript:{video_id}", self._get_transcript, video_id)
+                video_info = info_future.result()
+                transcript = transcript_future.result()
             
-            # Get lyrics
-            lyrics = self._get_lyrics(video_info['title'], video_info['channel'])
+            # Lyrics search needs the title and channel; long transcripts are talks, not songs
+            if len(transcript) > MAX_LYRICS_TRANSCRIPT_CHARS:
+                lyrics = ""
+            else:
+                # Info cached by older versions may lack 'length'
+                lyrics = self._single_flight(
+                    f"lyrics:{video_id}", self._get_lyrics,
+                    video_info['title'], video_info['channel'], video_info.get('length', 0)
+                )
             
             # Combine metadata, transcript, and lyrics
             content = f"YouTube Video: {video_info['title']}\n"
@@ -57,6 +244,27 @@ class YouTubeProcessor:
         except Exception as e:
             raise Exception(f"Error processing YouTube video {youtube_url}: {str(e)}")
     
+    def process_many(self, youtube_urls: list, workers: int = 8) -> list:
+        """
+        Process several YouTube URLs concurrently over the shared session
+        
+        Args:
+            youtube_urls: YouTube video URLs
+            workers: Number of worker threads
+            
+        Returns:
+            List of results in the same order as youtube_urls; None for URLs that failed
+        """
+        def process_one(youtube_url):
+            try:
+                return self.process(youtube_url)
+            except Exception as e:
+                logger.warning("%s", e)  # already names the URL
+                return None
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(process_one, youtube_urls))
+    
     def _extract_video_id(self, url: str) -> str:
         """
         Extract video ID from YouTube URL
@@ -71,19 +279,8 @@ class YouTubeProcessor:
         if '/results?' in url or 'search_query=' in url:
             return ""
         
-        patterns = [
-            r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-            r'(?:embed\/)([0-9A-Za-z_-]{11})',
-            r'(?:v=)([0-9A-Za-z_-]{11})',
-            r'^([0-9A-Za-z_-]{11})$'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        return ""
+        match = _VIDEO_ID_RE.search(url)
+        return (match.group(1) or match.group(2)) if match else ""
     
     def _get_video_info(self, url: str) -> dict:
         """
@@ -95,33 +292,34 @@ class YouTubeProcessor:
         Returns:
             Dictionary with video information
         """
+        cache_key = f"info:{self._extract_video_id(url) or url}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(url)
-            response.encoding = 'utf-8'
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title
-            title_tag = soup.find('meta', property='og:title')
-            title = title_tag['content'] if title_tag else 'YouTube Video'
-            
-            # Extract channel
-            channel_tag = soup.find('link', {'itemprop': 'name'})
-            channel = channel_tag['content'] if channel_tag else 'Unknown Channel'
+            # Only three tags are needed, so skip building a DOM for the whole page
+            tags = self._read_tags(url)
             
-            # Extract description
-            desc_tag = soup.find('meta', property='og:description')
-            description = desc_tag['content'] if desc_tag else ''
+            title = tags.get('title', 'YouTube Video')
+            channel = tags.get('channel', 'Unknown Channel')
+            description = tags.get('description', '')
+            length = self._parse_duration(tags.get('duration', ''))
             
-            print(f"Extracted: {title} by {channel}")
+            logger.debug("Extracted: %s by %s", title, channel)
             
-            return {
+            info = {
                 'title': title,
                 'channel': channel,
                 'description': description,
-                'length': 0
+                'length': length
             }
+            # A page without a title (consent wall, bot check) is not worth caching
+            if 'title' in tags:
+                self._cache_set(cache_key, info, INFO_TTL)
+            return info
         except Exception as e:
-            print(f"Metadata extraction failed: {e}")
+            logger.warning("Metadata extraction failed: %s", e)
             return {
                 'title': 'YouTube Video',
                 'channel': 'Unknown Channel',
@@ -129,6 +327,53 @@ class YouTubeProcessor:
                 'length': 0
             }
     
+    def _read_tags(self, url: str) -> dict:
+        """
+        Download a watch page only as far as needed to find every tag in _INFO_TAGS
+        
+        Args:
+            url: YouTube URL
+            
+        Returns:
+            Dictionary of the decoded, unescaped tag values that were found
+        """
+        body = bytearray()
+        matches = {}
+        with self._session.get(url, stream=True, timeout=15) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=8192):
+                # Re-scan a little of the previous chunk in case a tag straddles the boundary
+                start = max(len(body) - 4096, 0)
+                body += chunk
+                for name, pattern in _INFO_TAGS.items():
+                    if name not in matches:
+                        match = pattern.search(body, start)
+                        if match:
+                            matches[name] = match
+                if len(matches) == len(_INFO_TAGS):
+                    break
+        
+        return {
+            name: html.unescape(match.group(1).decode('utf-8', errors='replace'))
+            for name, match in matches.items()
+        }
+    
+    def _parse_duration(self, duration: str) -> int:
+        """
+        Convert an ISO 8601 duration such as PT4M13S to seconds
+        
+        Args:
+            duration: Duration string from the watch page
+            
+        Returns:
+            Length in seconds, or 0 if unknown
+        """
+        match = _ISO_DURATION_RE.fullmatch(duration)
+        if not match:
+            return 0
+        hours, minutes, seconds = (int(part or 0) for part in match.groups())
+        return hours * 3600 + minutes * 60 + seconds
+    
     def _get_transcript(self, video_id: str) -> str:
         """
         Get video transcript using youtube_transcript_api
@@ -139,68 +384,90 @@ class YouTubeProcessor:
         Returns:
             Video transcript text
         """
+        from youtube_transcript_api import YouTubeTranscriptApi
+        from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
+        
+        cache_key = f"transcript:{video_id}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Try to get English transcript first
             api = YouTubeTranscriptApi()
             transcript_obj = api.fetch(video_id, languages=['en'])
-            transcript_data = transcript_obj.to_raw_data()
-            transcript_text = ' '.join([entry['text'] for entry in transcript_data])
-            print(f"Successfully extracted English transcript ({len(transcript_text)} chars)")
+            # Join straight from the snippets rather than copying them into dicts first
+            transcript_text = ' '.join(snippet.text for snippet in transcript_obj)
+            logger.debug("Successfully extracted English transcript (%d chars)", len(transcript_text))
+            self._cache_set(cache_key, transcript_text, TRANSCRIPT_TTL)
             return transcript_text
             
         except (TranscriptsDisabled, NoTranscriptFound) as e:
-            print(f"English transcript not available: {e}")
+            logger.debug("English transcript not available: %s", e)
             try:
                 # Try to get any available transcript
                 api = YouTubeTranscriptApi()
                 transcript_list = api.list(video_id)
                 transcript = next(iter(transcript_list))
                 transcript_obj = transcript.fetch()
-                transcript_data = transcript_obj.to_raw_data()
-                transcript_text = ' '.join([entry['text'] for entry in transcript_data])
-                print(f"Successfully extracted transcript in {transcript.language}: ({len(transcript_text)} chars)")
+                transcript_text = ' '.join(snippet.text for snippet in transcript_obj)
+                logger.debug("Successfully extracted transcript in %s: (%d chars)", transcript.language, len(transcript_text))
+                self._cache_set(cache_key, transcript_text, TRANSCRIPT_TTL)
                 return transcript_text
                 
             except Exception as e2:
-                print(f"No transcripts available: {e2}")
+                logger.info("No transcripts available: %s", e2)
                 return ""
         except Exception as e:
-            print(f"Transcript extraction failed: {e}")
+            logger.warning("Transcript extraction failed: %s", e)
             return ""
     
-    def _get_lyrics(self, title: str, artist: str) -> str:
+    def _get_lyrics(self, title: str, artist: str, length: int = 0) -> str:
         """
         Get song lyrics using multiple sources
         
         Args:
             title: Video/song title
             artist: Channel/artist name
+            length: Video length in seconds, 0 if unknown
             
         Returns:
             Song lyrics text
         """
         try:
+            # Long videos and talk/news channels are not songs; don't wait on the lyrics API for them
+            if length > MAX_SONG_SECONDS or _NON_MUSIC_CHANNEL_RE.search(artist):
+                logger.debug("Skipping lyrics search for non-music content")
+                return ""
+            
             # Clean title and artist for better search
             clean_title = self._clean_search_term(title)
             clean_artist = self._clean_search_term(artist)
             
-            print(f"Searching lyrics for: '{clean_title}' by '{clean_artist}'")
+            logger.debug("Searching lyrics for: '%s' by '%s'", clean_title, clean_artist)
             
             # Skip lyrics search for educational/tutorial content
             if any(term in clean_title.lower() for term in ['tutorial', 'lesson', 'course', 'learn', 'guide', 'how to', 'java', 'features']):
-                print("Skipping lyrics search for educational content")
+                logger.debug("Skipping lyrics search for educational content")
                 return ""
             
+            cache_key = f"lyrics:{clean_artist}:{clean_title}"
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+            
             # Try Lyrics.ovh API with timeout handling
             lyrics = self._get_lyrics_from_ovh(clean_artist, clean_title)
             if lyrics:
+                self._cache_set(cache_key, lyrics, LYRICS_TTL)
                 return lyrics
             
-            print("No lyrics found from any source")
+            logger.debug("No lyrics found from any source")
+            self._cache_set(cache_key, "", LYRICS_MISS_TTL)
             return ""
             
         except Exception as e:
-            print(f"Lyrics extraction failed: {e}")
+            logger.warning("Lyrics extraction failed: %s", e)
             return ""
     
     def _clean_search_term(self, term: str) -> str:
@@ -213,19 +480,8 @@ class YouTubeProcessor:
         Returns:
             Cleaned search term
         """
-        # Remove common video suffixes
-        term = re.sub(r'\s*\(.*?\)', '', term)  # Remove parentheses content
-        term = re.sub(r'\s*\[.*?\]', '', term)  # Remove brackets content
-        term = re.sub(r'\s*-\s*(official|music|video|lyric|audio|ft\.|feat\.|featuring).*$', '', term, flags=re.IGNORECASE)
-        term = re.sub(r'\s*(official|music|video|lyric|audio|ft\.|feat\.|featuring)\s*', ' ', term, flags=re.IGNORECASE)
-        term = re.sub(r'\s*(4K|HD|HQ|remaster|remastered)\s*', ' ', term, flags=re.IGNORECASE)
-        term = re.sub(r'\s+', ' ', term).strip()  # Clean multiple spaces
-        
-        # For artist names, remove common suffixes
-        if 'VEVO' in term:
-            term = re.sub(r'VEVO$', '', term, flags=re.IGNORECASE).strip()
-        
-        return term
+        term = _STRIP_RE.sub(' ', term)
+        return _RE_SPACES.sub(' ', term).strip()  # Clean multiple spaces
     
     def _get_lyrics_from_ovh(self, artist: str, title: str) -> str:
         """
@@ -238,21 +494,44 @@ class YouTubeProcessor:
         Returns:
             Lyrics text or empty string
         """
+        import requests
+        
+        key = (artist, title)
+        with self._inflight_lock:
+            if key in self._ovh_missing:
+                self._ovh_missing.move_to_end(key)
+                return ""
+        
         try:
-            url = f"https://api.lyrics.ovh/v1/{artist}/{title}"
-            response = requests.get(url, timeout=30)
+            # Slashes, '?' and '#' in titles would otherwise break the path
+            url = f"https://api.lyrics.ovh/v1/{quote(artist, safe='')}/{quote(title, safe='')}"
+            # Short timeout with one retry; a slow lyrics API shouldn't hold up the whole video
+            for attempt in range(2):
+                try:
+                    response = self._session.get(url, timeout=5)
+                    break
+                except requests.exceptions.Timeout:
+                    if attempt:
+                        raise
+                    time.sleep(1)
             
             if response.status_code == 200:
                 data = response.json()
                 lyrics = data.get('lyrics', '').strip()
                 if lyrics:
-                    print(f"Found lyrics from Lyrics.ovh ({len(lyrics)} chars)")
+                    logger.debug("Found lyrics from Lyrics.ovh (%d chars)", len(lyrics))
                     return lyrics
+            elif response.status_code == 404:
+                # A 404 means the song isn't there, so don't ask again
+                with self._inflight_lock:
+                    self._ovh_missing[key] = True
+                    if len(self._ovh_missing) > self._ovh_missing_size:
+                        self._ovh_missing.popitem(last=False)
             
         except requests.exceptions.Timeout:
-            print(f"Lyrics.ovh API timeout - skipping lyrics search")
+            logger.info("Lyrics.ovh API timeout - skipping lyrics search")
         except Exception as e:
-            print(f"Lyrics.ovh API failed: {e}")
+            logger.warning("Lyrics.ovh API failed: %s", e)
         
         return ""
     
@@ -267,48 +546,48 @@ class YouTubeProcessor:
         Returns:
             Lyrics text or empty string
         """
+        from bs4 import BeautifulSoup, SoupStrainer
+        
         try:
             # Search for the song on Genius
-            search_query = f"{artist} {title}".replace(' ', '%20')
+            search_query = quote(f"{artist} {title}", safe='')
             search_url = f"https://genius.com/search?q={search_query}"
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(search_url, headers=headers, timeout=10)
+            response = self._session.get(search_url, timeout=10)
             if response.status_code != 200:
                 return ""
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Only the song links are parsed
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=SoupStrainer('a', class_='mini_card'))
             
             # Find the first song link
-            song_links = soup.find_all('a', class_='mini_card')
-            if not song_links:
+            song_link = soup.select_one('a.mini_card')
+            if not song_link:
                 return ""
             
-            song_url = 'https://genius.com' + song_links[0].get('href')
+            song_url = 'https://genius.com' + song_link.get('href')
             
             # Get lyrics from the song page
-            song_response = requests.get(song_url, headers=headers, timeout=10)
+            song_response = self._session.get(song_url, timeout=10)
             if song_response.status_code != 200:
                 return ""
             
-            song_soup = BeautifulSoup(song_response.content, 'html.parser')
+            # Only the lyrics containers are parsed
+            song_soup = BeautifulSoup(song_response.content, HTML_PARSER, parse_only=SoupStrainer('div', attrs={'data-lyrics-container': 'true'}))
             
-            # Find lyrics container (Genius uses different selectors)
-            lyrics_containers = song_soup.find_all('div', {'data-lyrics-container': 'true'})
+            # The strainer leaves only the lyrics containers, all at the top level
+            lyrics_containers = song_soup.find_all('div', recursive=False)
             
             if lyrics_containers:
-                lyrics_text = ''
-                for container in lyrics_containers:
-                    lyrics_text += container.get_text(separator='\n', strip=True) + '\n'
+                lyrics_text = '\n'.join(
+                    container.get_text(separator='\n', strip=True) for container in lyrics_containers
+                )
                 
                 if lyrics_text.strip():
-                    print(f"Found lyrics from Genius.com ({len(lyrics_text)} chars)")
+                    logger.debug("Found lyrics from Genius.com (%d chars)", len(lyrics_text))
                     return lyrics_text.strip()
             
         except Exception as e:
-            print(f"Genius scraping failed: {e}")
+            logger.warning("Genius scraping failed: %s", e)
         
         return ""
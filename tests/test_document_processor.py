@@ -0,0 +1,67 @@
+import threading
+import pytest
+
+pytest.importorskip("pypdfium2")
+pytest.importorskip("docx")
+pytest.importorskip("pptx")
+
+from processors import document_processor
+from processors.document_processor import DocumentProcessor
+
+def _write_pdf(path, text: str):
+    """Write a one-page PDF that shows text in Helvetica"""
+    stream = f"BT /F1 24 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+def test_pdfs_extracted_from_two_threads_at_once(tmp_path, monkeypatch):
+    paths = {}
+    for text in ("First document", "Second document"):
+        paths[text] = tmp_path / f"{text.split()[0].lower()}.pdf"
+        _write_pdf(paths[text], text)
+    
+    # Every in-process PDFium document must be opened under the module lock
+    open_document = document_processor.pdfium.PdfDocument
+    def checked_open(*args, **kwargs):
+        assert document_processor._PDFIUM_LOCK.locked()
+        return open_document(*args, **kwargs)
+    monkeypatch.setattr(document_processor.pdfium, "PdfDocument", checked_open)
+    
+    processor = DocumentProcessor()
+    barrier = threading.Barrier(2)
+    results = {text: [] for text in paths}
+    errors = []
+    
+    def extract(text):
+        try:
+            barrier.wait()
+            for _ in range(20):
+                results[text].append(processor.process(str(paths[text])))
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=extract, args=(text,)) for text in paths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert not errors
+    for text, extracted in results.items():
+        assert extracted == [text] * 20
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from processors.youtube_processor import MAX_LYRICS_TRANSCRIPT_CHARS, YouTubeProcessor
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+@pytest.mark.parametrize("length, looked_up", [
+    (MAX_LYRICS_TRANSCRIPT_CHARS - 1, True),
+    (MAX_LYRICS_TRANSCRIPT_CHARS, True),
+    (MAX_LYRICS_TRANSCRIPT_CHARS + 1, False),
+])
+def test_lyrics_skipped_only_past_transcript_limit(monkeypatch, length, looked_up):
+    assert MAX_LYRICS_TRANSCRIPT_CHARS == 3000
+    processor = YouTubeProcessor()
+    lookups = []
+    
+    def get_lyrics(title, artist, length=0):
+        lookups.append((title, artist, length))
+        return "la la la"
+    
+    monkeypatch.setattr(processor, "_get_video_info", lambda url: {
+        'title': "Song", 'channel': "Artist", 'description': "", 'length': 180
+    })
+    monkeypatch.setattr(processor, "_get_transcript", lambda video_id: "x" * length)
+    monkeypatch.setattr(processor, "_get_lyrics", get_lyrics)
+    
+    try:
+        content = processor.process(URL)
+    finally:
+        processor.close()
+    
+    assert lookups == ([("Song", "Artist", 180)] if looked_up else [])
+    assert ("Lyrics:\nla la la" in content) == looked_up
@@ -0,0 +1,55 @@
+import re
+from typing import List
+
+_PARAGRAPH_BREAK = re.compile(r'\n\n')
+_SENTENCE_END = re.compile(r'\.\s+')
+
+def chunk_text(text: str, max_chunk_size: int = 500) -> List[str]:
+    """
+    Split text into chunks for better processing.
+    Scans paragraph and sentence boundaries once and slices the original text.
+    
+    Args:
+        text: Input text
+        max_chunk_size: Maximum characters per chunk
+    
+    Returns:
+        List of text chunks
+    """
+    if len(text) <= max_chunk_size:
+        return [text]
+    
+    chunks = []
+    start = end = 0  # Pending chunk is text[start:end]; empty when start == end
+    
+    para_start = 0
+    para_ends = [m.start() for m in _PARAGRAPH_BREAK.finditer(text)] + [len(text)]
+    for para_end in para_ends:
+        # If adding this paragraph would exceed the limit
+        if (end - start) + (para_end - para_start) + 2 > max_chunk_size:
+            if end > start:
+                chunks.append(text[start:end].strip())
+            start = end = para_start
+            
+            # If paragraph itself is too long, split by sentences
+            if para_end - para_start > max_chunk_size:
+                sentence_ends = [
+                    m.end() for m in _SENTENCE_END.finditer(text, para_start, para_end)
+                ] + [para_end]
+                sentence_start = para_start
+                for sentence_end in sentence_ends:
+                    if sentence_end - start > max_chunk_size and sentence_start > start:
+                        chunks.append(text[start:sentence_start].strip())
+                        start = sentence_start
+                    sentence_start = sentence_end
+            end = para_end
+        elif end > start:
+            end = para_end
+        else:
+            start, end = para_start, para_end
+        para_start = para_end + 2
+    
+    if end > start:
+        chunks.append(text[start:end].strip())
+    
+    return [chunk for chunk in chunks if chunk]
@@ -46,9 +46,12 @@ def save_uploaded_file(uploaded_file) -> str:
         suffix = Path(uploaded_file.name).suffix
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
         
-        # Write uploaded file content to temporary file
-        temp_file.write(uploaded_file.getvalue())
-        temp_file.close()
+        # Copy uploaded content in 1 MB chunks instead of materializing a second full copy
+        uploaded_file.seek(0)
+        with temp_file:
+            while chunk := uploaded_file.read(1 << 20):
+                temp_file.write(chunk)
+        uploaded_file.seek(0)
         
         return temp_file.name
         
@@ -90,6 +93,19 @@ def validate_file_type(filename: str, allowed_types: list) -> bool:
     extension = Path(filename).suffix.lower()
     return extension in allowed_types
 
+def make_preview(text: str, length: int = 200) -> str:
+    """
+    Build a short preview of text content for display
+    
+    Args:
+        text: Text content
+        length: Maximum preview length before the ellipsis
+        
+    Returns:
+        Text truncated to length characters, with "..." appended if it was cut
+    """
+    return text[:length] + "..." if len(text) > length else text
+
 def clean_text(text: str) -> str:
     """
     Clean and normalize text content
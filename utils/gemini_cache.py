@@ -0,0 +1,113 @@
+import os
+import hashlib
+import logging
+import threading
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Entries expire so that results from older model versions eventually get refreshed
+CACHE_TTL = 30 * 86400
+
+# Fallback strings GeminiClient returns when the model gives no answer; never cached
+FAILURE_RESULTS = frozenset({"Unable to analyze image", "Unable to analyze video"})
+
+# Results of slow model calls (Gemini analyses, Whisper transcripts) keyed by input file content;
+# opened on first use so importing the module doesn't create the cache directory
+_cache_lock = threading.Lock()
+_cache = None
+_cache_opened = False
+
+def _get_cache():
+    """
+    Open the shared diskcache on first use and return it
+    
+    Returns:
+        The diskcache.Cache, or None when diskcache is missing or the cache could not be opened
+    """
+    global _cache, _cache_opened
+    if not _cache_opened:
+        with _cache_lock:
+            # Another thread may have opened it while we waited
+            if not _cache_opened:
+                if DISKCACHE_AVAILABLE:
+                    try:
+                        _cache = diskcache.Cache(os.getenv("GEMINI_CACHE_DIR", "./.gemini_cache"))
+                    except Exception as e:
+                        logger.warning("Could not open analysis cache: %s", e)
+                _cache_opened = True
+    return _cache
+
+def enabled() -> bool:
+    """Whether results are being cached"""
+    return _get_cache() is not None
+
+def file_digest(file_path: str) -> str:
+    """
+    Hash a file's contents with BLAKE2b, reading it in 1 MiB blocks
+    
+    Args:
+        file_path: Path to the file
+    
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(file_path, 'rb') as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+def make_key(kind: str, model: str, file_path: str) -> str:
+    """Cache key for one kind of analysis of a file by a given model"""
+    return f"{kind}:{model}:{file_digest(file_path)}"
+
+def lookup(key: str):
+    """Return the cached value for key, or None"""
+    cache = _get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning("Could not read analysis cache: %s", e)
+        return None
+
+def store(key: str, value):
+    """Store a value for CACHE_TTL; empty and failure results are not cached so they are retried next time"""
+    cache = _get_cache()
+    if cache is None or not value:
+        return
+    if isinstance(value, str) and value in FAILURE_RESULTS:
+        return
+    try:
+        cache.set(key, value, expire=CACHE_TTL)
+    except Exception as e:
+        logger.warning("Could not write analysis cache: %s", e)
+
+def cached_call(kind: str, model: str, file_path: str, compute):
+    """
+    Return a cached result for this file's contents, computing and storing it on a miss
+    
+    Args:
+        kind: Kind of analysis (e.g. 'image', 'video')
+        model: Model name, so results from different models don't mix
+        file_path: Input file whose contents key the result
+        compute: Zero-argument callable producing the result
+    
+    Returns:
+        Cached or freshly computed result
+    """
+    if _get_cache() is None:
+        return compute()
+    
+    key = make_key(kind, model, file_path)
+    value = lookup(key)
+    if value is None:
+        value = compute()
+        store(key, value)
+    return value
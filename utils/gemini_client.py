@@ -17,13 +17,15 @@ class GeminiClient:
         
         self.client = genai.Client(api_key=self.__api_key)
         self.model = "gemini-2.5-flash"  # Default model
+        self.vision_model = "gemini-2.5-pro"  # Used for image and video analysis
     
-    def analyze_image(self, image_path: str) -> str:
+    def analyze_image(self, image_path: str, mime_type: str = "image/jpeg") -> str:
         """
         Analyze an image using Gemini Vision
         
         Args:
             image_path: Path to the image file
+            mime_type: MIME type of the image (JPEG, PNG and WebP are accepted)
             
         Returns:
             Image analysis description
@@ -33,11 +35,11 @@ class GeminiClient:
                 image_bytes = f.read()
                 
             response = self.client.models.generate_content(
-                model="gemini-2.5-pro",  # Use pro model for vision
+                model=self.vision_model,  # Use pro model for vision
                 contents=[
                     types.Part.from_bytes(
                         data=image_bytes,
-                        mime_type="image/jpeg",
+                        mime_type=mime_type,
                     ),
                     "Analyze this image in detail. Describe its content, objects, people, text, " +
                     "context, and any other relevant information that could be useful for answering questions about it.",
@@ -64,7 +66,7 @@ class GeminiClient:
                 video_bytes = f.read()
                 
             response = self.client.models.generate_content(
-                model="gemini-2.5-pro",  # Use pro model for video
+                model=self.vision_model,  # Use pro model for video
                 contents=[
                     types.Part.from_bytes(
                         data=video_bytes,